@@ -1,7 +1,19 @@
-import sympy as sp
+import argparse
+import os
+import sys
+
+# The shared numerical_methods package lives in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import newton
+
+from numerical_methods.adaptive_ode import dormand_prince
+from numerical_methods.expression_cache import compile_expression
+from numerical_methods.high_precision import high_precision_root, mpmath_string
+from numerical_methods.ode_systems import compile_system, parse_system
+from numerical_methods.plotting import plot_trajectory
+from numerical_methods.result_cache import DEFAULT_MAX_BYTES, DEFAULT_PATH, open_cache
+from numerical_methods.root_scan import find_all_roots
 
 
 # Define Methods
@@ -41,7 +53,7 @@ def simpsons_rule(f, a, b, n):
 
 def euler_method(f, y0, x0, x_end, h):
     x = np.arange(x0, x_end, h)
-    y = np.zeros(len(x))
+    y = np.zeros((len(x),) + np.shape(y0))  # one column per equation of a system
     y[0] = y0
     for i in range(1, len(x)):
         y[i] = y[i - 1] + h * f(x[i - 1], y[i - 1])
@@ -50,7 +62,7 @@ def euler_method(f, y0, x0, x_end, h):
 
 def runge_kutta_4(f, y0, x0, x_end, h):
     x = np.arange(x0, x_end, h)
-    y = np.zeros(len(x))
+    y = np.zeros((len(x),) + np.shape(y0))  # one column per equation of a system
     y[0] = y0
     for i in range(1, len(x)):
         k1 = h * f(x[i - 1], y[i - 1])
@@ -62,9 +74,15 @@ def runge_kutta_4(f, y0, x0, x_end, h):
 
 
 # Define Input Parsing
-def parse_expression(expr):
-    x = sp.Symbol('x')
-    return sp.lambdify(x, sp.sympify(expr), 'numpy')
+def parse_expression(expr, variables=('x',)):
+    return compile_expression(expr, variables).func
+
+
+def parse_ode(expr_text, y0_text):
+    # Semicolon-separated right-hand sides in y1, ..., yn make a system.
+    expr, y0 = parse_system(expr_text, y0_text)
+    f = compile_system(expr) if isinstance(expr, list) else parse_expression(expr, ('x', 'y'))
+    return expr, y0, f
 
 
 def get_user_input():
@@ -74,11 +92,16 @@ def get_user_input():
     print("3. Simpson's Rule")
     print("4. Euler Method")
     print("5. Runge-Kutta Method")
+    print("6. Dormand-Prince Method (adaptive step)")
+    print("7. All Roots in an Interval")
+    print("8. High-Precision Root (50-1000 digits)")
     choice = input("Enter the number of the method you want to use: ")
 
     # Default return values
-    f_bisection = f_newton = f_newton_prime = f_simpson = f_euler_rk = None
-    a = b = a_simpson = b_simpson = x0 = n = x0_euler_rk = x_end = y0 = h = None
+    expr = None
+    f_bisection = f_newton = f_newton_prime = f_simpson = f_euler_rk = f_adaptive = all_roots_expr = None
+    a = b = a_simpson = b_simpson = x0 = n = x0_euler_rk = x_end = y0 = h = rtol = atol = None
+    precise_expr = digits = None
 
     if choice == "1":
         expr = input("Enter the function expression (e.g., x**3 - x - 2): ")
@@ -92,6 +115,7 @@ def get_user_input():
         x0 = float(input("Enter the initial guess (x0): "))
         f_newton = parse_expression(expr)
         f_newton_prime = parse_expression(expr_prime)
+        expr = [expr, expr_prime]
 
     elif choice == "3":
         expr = input("Enter the function expression (e.g., x**2): ")
@@ -101,68 +125,98 @@ def get_user_input():
         f_simpson = parse_expression(expr)
 
     elif choice == "4":
-        expr = input("Enter the function expression (e.g., x + y): ")
-        y0 = float(input("Enter the initial value (y0): "))
+        expr = input("Enter the function expression (e.g., x + y, or y2; -y1 for a system): ")
+        y0_text = input("Enter the initial value (y0, one per equation, e.g. 1, 0): ")
         x0_euler_rk = float(input("Enter the start of the interval (x0): "))
         x_end = float(input("Enter the end of the interval (x_end): "))
         h = float(input("Enter the step size (h): "))
-        f_euler_rk = parse_expression(expr)
+        expr, y0, f_euler_rk = parse_ode(expr, y0_text)
 
     elif choice == "5":
-        expr = input("Enter the function expression (e.g., x + y): ")
-        y0 = float(input("Enter the initial value (y0): "))
+        expr = input("Enter the function expression (e.g., x + y, or y2; -y1 for a system): ")
+        y0_text = input("Enter the initial value (y0, one per equation, e.g. 1, 0): ")
         x0_euler_rk = float(input("Enter the start of the interval (x0): "))
         x_end = float(input("Enter the end of the interval (x_end): "))
         h = float(input("Enter the step size (h): "))
-        f_euler_rk = parse_expression(expr)
+        expr, y0, f_euler_rk = parse_ode(expr, y0_text)
+
+    elif choice == "6":
+        expr = input("Enter the function expression (e.g., x + y, or y2; -y1 for a system): ")
+        y0_text = input("Enter the initial value (y0, one per equation, e.g. 1, 0): ")
+        x0_euler_rk = float(input("Enter the start of the interval (x0): "))
+        x_end = float(input("Enter the end of the interval (x_end): "))
+        rtol = float(input("Enter the relative tolerance (e.g., 1e-6): "))
+        atol = float(input("Enter the absolute tolerance (e.g., 1e-9): "))
+        expr, y0, f_adaptive = parse_ode(expr, y0_text)
+
+    elif choice == "7":
+        all_roots_expr = expr = input("Enter the function expression (e.g., x**3 - 6*x**2 + 11*x - 6): ")
+        a = float(input("Enter the lower bound (a): "))
+        b = float(input("Enter the upper bound (b): "))
+
+    elif choice == "8":
+        precise_expr = expr = input("Enter the function expression (e.g., x**3 - x - 2): ")
+        x0 = float(input("Enter the initial guess (x0): "))
+        digits = int(input("Enter the number of digits (e.g., 100): "))
 
     else:
         print("Invalid choice.")
 
     return (f_bisection, a, b, f_newton, f_newton_prime, x0, f_simpson, a_simpson, b_simpson, n,
-            f_euler_rk, y0, x0_euler_rk, x_end, h)
+            f_euler_rk, y0, x0_euler_rk, x_end, h, f_adaptive, rtol, atol, all_roots_expr, precise_expr, digits, expr)
 
 
 def plot_results(x, y, title):
-    plt.figure()
-    plt.plot(x, y, 'o-', label=title)
-    plt.xlabel('x')
-    plt.ylabel('y')
-    plt.title(title)
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    # Downsampled to the screen width and drawn on one reused figure.
+    plot_trajectory(x, y, title)
+
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive numerical methods solver.")
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_PATH, default=None, metavar='PATH',
+                        help="reuse results stored in this SQLite file (default path if omitted; "
+                             "also enabled by $NUMERICAL_METHODS_CACHE)")
+    parser.add_argument('--no-cache', action='store_true', help="bypass the result cache")
+    parser.add_argument('--cache-size-mb', type=float, default=DEFAULT_MAX_BYTES / 2 ** 20,
+                        help="evict old results beyond this size")
+    args = parser.parse_args(argv)
+    cache = open_cache(args.cache, args.no_cache, int(args.cache_size_mb * 2 ** 20))
 
-def main():
     while True:
         (f_bisection, a, b, f_newton, f_newton_prime, x0, f_simpson, a_simpson, b_simpson, n,
-         f_euler_rk, y0, x0_euler_rk, x_end, h) = get_user_input()
+         f_euler_rk, y0, x0_euler_rk, x_end, h, f_adaptive, rtol, atol, all_roots_expr, precise_expr, digits,
+         expr) = get_user_input()
 
         if f_bisection is not None and a is not None and b is not None:
             try:
-                root_bisection = bisection_method(f_bisection, a, b)
+                root_bisection = cache.get_or_compute('cli_solver.bisection', expr, {'a': a, 'b': b},
+                                                      lambda: bisection_method(f_bisection, a, b))
                 print(f"Root found using Bisection Method: {root_bisection}")
             except ValueError as e:
                 print(f"Bisection Method Error: {e}")
 
         if f_newton is not None and f_newton_prime is not None and x0 is not None:
             try:
-                root_newton = newton_raphson_method(f_newton, f_newton_prime, x0)
+                root_newton = cache.get_or_compute('cli_solver.newton', expr, {'x0': x0},
+                                                   lambda: newton_raphson_method(f_newton, f_newton_prime, x0))
                 print(f"Root found using Newton-Raphson Method: {root_newton}")
             except ValueError as e:
                 print(f"Newton-Raphson Method Error: {e}")
 
         if f_simpson is not None and a_simpson is not None and b_simpson is not None and n is not None:
             try:
-                integral_simpsons = simpsons_rule(f_simpson, a_simpson, b_simpson, n)
+                integral_simpsons = cache.get_or_compute(
+                    'cli_solver.simpson', expr, {'a': a_simpson, 'b': b_simpson, 'n': n},
+                    lambda: simpsons_rule(f_simpson, a_simpson, b_simpson, n))
                 print(f"Integral computed using Simpson's Rule: {integral_simpsons}")
             except ValueError as e:
                 print(f"Simpson's Rule Error: {e}")
 
         if f_euler_rk is not None and y0 is not None and x0_euler_rk is not None and x_end is not None and h is not None:
             try:
-                x_euler, y_euler = euler_method(f_euler_rk, y0, x0_euler_rk, x_end, h)
+                x_euler, y_euler = cache.get_or_compute(
+                    'cli_solver.euler', expr, {'y0': y0, 'x0': x0_euler_rk, 'x_end': x_end, 'h': h},
+                    lambda: euler_method(f_euler_rk, y0, x0_euler_rk, x_end, h))
                 print(f"Euler Method Results: x={x_euler}, y={y_euler}")
                 plot_results(x_euler, y_euler, "Euler Method")
             except ValueError as e:
@@ -170,12 +224,46 @@ def main():
 
         if f_euler_rk is not None and y0 is not None and x0_euler_rk is not None and x_end is not None and h is not None:
             try:
-                x_rk, y_rk = runge_kutta_4(f_euler_rk, y0, x0_euler_rk, x_end, h)
+                x_rk, y_rk = cache.get_or_compute(
+                    'cli_solver.runge_kutta_4', expr, {'y0': y0, 'x0': x0_euler_rk, 'x_end': x_end, 'h': h},
+                    lambda: runge_kutta_4(f_euler_rk, y0, x0_euler_rk, x_end, h))
                 print(f"Runge-Kutta Results: x={x_rk}, y={y_rk}")
                 plot_results(x_rk, y_rk, "Runge-Kutta Method")
             except ValueError as e:
                 print(f"Runge-Kutta Method Error: {e}")
 
+        if f_adaptive is not None and y0 is not None and x0_euler_rk is not None and x_end is not None:
+            try:
+                result = cache.get_or_compute(
+                    'cli_solver.dormand_prince', expr,
+                    {'y0': y0, 'x0': x0_euler_rk, 'x_end': x_end, 'rtol': rtol, 'atol': atol},
+                    lambda: dormand_prince(f_adaptive, y0, x0_euler_rk, x_end, rtol=rtol, atol=atol))
+                print(f"Dormand-Prince Results: x={result.x}, y={result.y}")
+                print(f"Accepted steps: {result.accepted_steps}, rejected steps: {result.rejected_steps}, "
+                      f"function evaluations: {result.evaluations}")
+                plot_results(result.x, result.y, "Dormand-Prince Method")
+            except ValueError as e:
+                print(f"Dormand-Prince Method Error: {e}")
+
+        if all_roots_expr is not None and a is not None and b is not None:
+            try:
+                roots = cache.get_or_compute('cli_solver.find_all_roots', all_roots_expr, {'a': a, 'b': b},
+                                             lambda: find_all_roots(all_roots_expr, a, b))
+                print(f"Roots found in [{a}, {b}]: {roots}")
+            except ValueError as e:
+                print(f"All Roots Error: {e}")
+
+        if precise_expr is not None and x0 is not None and digits is not None:
+            try:
+                # Cached as a string: the digits do not survive as a float.
+                root = cache.get_or_compute('cli_solver.high_precision_root', precise_expr,
+                                            {'x0': x0, 'digits': digits},
+                                            lambda: mpmath_string(high_precision_root(precise_expr, x0, digits).root,
+                                                                  digits))
+                print(f"Root to {digits} digits: {root}")
+            except ValueError as e:
+                print(f"High-Precision Root Error: {e}")
+
         # Prompt the user to continue or exit
         cont = input("Do you want to run another method? (yes/no): ").strip().lower()
         if cont != "yes":
@@ -1,9 +1,15 @@
+import os
+import sys
+
+# The shared numerical_methods package lives in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import customtkinter
 from tkinter import messagebox
 import numpy as np
-import sympy as sp
-import numpy as np
-import sympy as sp
+
+from numerical_methods.adaptive_quadrature import adaptive_simpson
+from numerical_methods.expression_cache import compile_expression
 
 def bisection_method(f, a, b, tol=1e-6, max_iter=100):
     if f(a) * f(b) >= 0:
@@ -19,9 +25,14 @@ def bisection_method(f, a, b, tol=1e-6, max_iter=100):
     raise ValueError("Maximum iterations exceeded.")
 
 def newton_raphson_method(f, f_prime, x0, tol=1e-6, max_iter=100):
+    return newton_raphson_fused(lambda x: (f(x), f_prime(x)), x0, tol, max_iter)
+
+def newton_raphson_fused(f_and_prime, x0, tol=1e-6, max_iter=100):
+    """Newton-Raphson with f and f' from one callable, e.g. compile_expression(...).fused()."""
     x = x0
     for _ in range(max_iter):
-        x_new = x - f(x) / f_prime(x)
+        f_x, f_prime_x = f_and_prime(x)  # f and f' from one fused call
+        x_new = x - f_x / f_prime_x
         if abs(x_new - x) < tol:
             return x_new
         x = x_new
@@ -59,48 +70,15 @@ def runge_kutta_4(f, y0, x0, x_end, h):
 # Import your previously written calculation methods (from earlier code)
 # from your_project import bisection_method, newton_raphson_method, simpsons_rule, euler_method, runge_kutta_4
 
-# Set up the GUI appearance
-customtkinter.set_appearance_mode("dark")
-customtkinter.set_default_color_theme("green")
-
-# Create the root window
-root = customtkinter.CTk()
-root.geometry("500x500")  # Adjust window size
-
 # Define the method for parsing the function
 def parse_expression(expr):
-    x = sp.Symbol('x')
-    return sp.lambdify(x, sp.sympify(expr), 'numpy')
-
-# Define the frame for the GUI
-frame = customtkinter.CTkFrame(master=root)
-frame.pack(pady=20, padx=60, fill="both", expand=True)
-label = customtkinter.CTkLabel(master=frame, text="Advanced Mathematical Solution System", font=("Roboto", 18))
-label.pack(pady=12, padx=10)
-
-# Create text entry for the function and inputs
-entry_function = customtkinter.CTkEntry(master=frame, placeholder_text="Enter Function (e.g., x**3 - x - 2)")
-entry_function.pack(pady=12, padx=10)
-
-entry_a = customtkinter.CTkEntry(master=frame, placeholder_text="Lower Bound / Initial Guess")
-entry_a.pack(pady=12, padx=10)
+    return compile_expression(expr, ('x',)).func
 
-entry_b = customtkinter.CTkEntry(master=frame, placeholder_text="Upper Bound / Initial Value")
-entry_b.pack(pady=12, padx=10)
-
-# Create the dropdown menu for method selection
+# Callback for the method dropdown
 def on_method_select(selected_method):
     messagebox.showinfo("Selected Method", f"You selected {selected_method}")
 
-option_menu = customtkinter.CTkOptionMenu(
-    frame,
-    values=["Bisection Method", "Newton-Raphson Method", "Simpson's Rule", "Euler Method", "Runge-Kutta Method"],
-    command=on_method_select
-)
-option_menu.pack(pady=12, padx=10)
-option_menu.set("Select a Method")
-
-# Create a button to perform the calculation
+# Perform the selected calculation
 def calculate():
     selected_method = option_menu.get()
     func_expression = entry_function.get()  # Get the function from user input
@@ -123,16 +101,17 @@ def calculate():
 
     elif selected_method == "Newton-Raphson Method":
         try:
-            f_prime = parse_expression(sp.diff(sp.sympify(func_expression)))  # Derivative for Newton-Raphson
-            root = newton_raphson_method(f, f_prime, float(a))
+            f_and_prime = compile_expression(func_expression, ('x',)).fused()  # f and f' for Newton-Raphson
+            root = newton_raphson_fused(f_and_prime, float(a))
             messagebox.showinfo("Result", f"Root found: {root}")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
     elif selected_method == "Simpson's Rule":
         try:
-            integral = simpsons_rule(f, float(a), float(b), 10)  # Using n=10 intervals for simplicity
-            messagebox.showinfo("Result", f"Integral: {integral}")
+            result = adaptive_simpson(f, float(a), float(b))  # Panels refined until the error estimate is met
+            messagebox.showinfo("Result", f"Integral: {result.integral}\n"
+                                          f"Error estimate: {result.error:.3g} ({result.evaluations} evaluations)")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
@@ -150,9 +129,44 @@ def calculate():
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
-# Create the calculate button
-button_calculate = customtkinter.CTkButton(master=frame, text="Calculate", command=calculate)
-button_calculate.pack(pady=12, padx=10)
 
-# Run the application
-root.mainloop()
+if __name__ == '__main__':
+    # Set up the GUI appearance
+    customtkinter.set_appearance_mode("dark")
+    customtkinter.set_default_color_theme("green")
+
+    # Create the root window
+    root = customtkinter.CTk()
+    root.geometry("500x500")  # Adjust window size
+
+    # Define the frame for the GUI
+    frame = customtkinter.CTkFrame(master=root)
+    frame.pack(pady=20, padx=60, fill="both", expand=True)
+    label = customtkinter.CTkLabel(master=frame, text="Advanced Mathematical Solution System", font=("Roboto", 18))
+    label.pack(pady=12, padx=10)
+
+    # Create text entry for the function and inputs
+    entry_function = customtkinter.CTkEntry(master=frame, placeholder_text="Enter Function (e.g., x**3 - x - 2)")
+    entry_function.pack(pady=12, padx=10)
+
+    entry_a = customtkinter.CTkEntry(master=frame, placeholder_text="Lower Bound / Initial Guess")
+    entry_a.pack(pady=12, padx=10)
+
+    entry_b = customtkinter.CTkEntry(master=frame, placeholder_text="Upper Bound / Initial Value")
+    entry_b.pack(pady=12, padx=10)
+
+    # Create the dropdown menu for method selection
+    option_menu = customtkinter.CTkOptionMenu(
+        frame,
+        values=["Bisection Method", "Newton-Raphson Method", "Simpson's Rule", "Euler Method", "Runge-Kutta Method"],
+        command=on_method_select
+    )
+    option_menu.pack(pady=12, padx=10)
+    option_menu.set("Select a Method")
+
+    # Create the calculate button
+    button_calculate = customtkinter.CTkButton(master=frame, text="Calculate", command=calculate)
+    button_calculate.pack(pady=12, padx=10)
+
+    # Run the application
+    root.mainloop()
@@ -1,7 +1,13 @@
+import os
+import sys
+
+# The shared numerical_methods package lives in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import newton
-import sympy as sp
+
+from numerical_methods.expression_cache import compile_expression
+from numerical_methods.plotting import plot_trajectory
 
 
 # Define Methods
@@ -21,9 +27,15 @@ def bisection_method(f, a, b, tol=1e-6, max_iter=100):
 
 
 def newton_raphson_method(f, f_prime, x0, tol=1e-6, max_iter=100):
+    return newton_raphson_fused(lambda x: (f(x), f_prime(x)), x0, tol, max_iter)
+
+
+def newton_raphson_fused(f_and_prime, x0, tol=1e-6, max_iter=100):
+    """Newton-Raphson with f and f' from one callable, e.g. compile_expression(...).fused()."""
     x = x0
     for _ in range(max_iter):
-        x_new = x - f(x) / f_prime(x)
+        f_x, f_prime_x = f_and_prime(x)  # f and f' from one fused call
+        x_new = x - f_x / f_prime_x
         if abs(x_new - x) < tol:
             return x_new
         x = x_new
@@ -70,11 +82,8 @@ def runge_kutta_4(f, y0, x0, x_end, h):
 
 # Parse expression into a function
 def parse_expression(expr, symbol='x'):
-    x = sp.Symbol(symbol)
-    parsed_expr = sp.sympify(expr)
-    f = sp.lambdify(x, parsed_expr, 'numpy')
-    f_prime = sp.lambdify(x, sp.diff(parsed_expr, x), 'numpy')
-    return f, f_prime
+    compiled = compile_expression(expr, (symbol,))
+    return compiled.func, compiled.derivative()
 
 
 # User Input Functions
@@ -105,52 +114,56 @@ def get_user_input():
     return expr, a, b, x0, a_simpson, b_simpson, n, y0, x0_euler_rk, x_end, h
 
 
-# Get User Inputs
-(expr, a, b, x0, a_simpson, b_simpson, n, y0, x0_euler_rk, x_end, h) = get_user_input()
+# Perform Calculations
+def solve_all():
+    # Get User Inputs
+    (expr, a, b, x0, a_simpson, b_simpson, n, y0, x0_euler_rk, x_end, h) = get_user_input()
 
-# Parse the expression for Newton-Raphson method
-f, f_prime = parse_expression(expr)
+    # Parse the expression; Newton-Raphson takes f and f' from one fused call
+    f, _ = parse_expression(expr)
 
-# Perform Calculations
-try:
-    root_bisection = bisection_method(f, a, b)
-    print(f"\nRoot found using Bisection Method: {root_bisection}")
-except ValueError as e:
-    print(e)
+    try:
+        root_bisection = bisection_method(f, a, b)
+        print(f"\nRoot found using Bisection Method: {root_bisection}")
+    except ValueError as e:
+        print(e)
+
+    try:
+        root_newton = newton_raphson_fused(compile_expression(expr, ('x',)).fused(), x0=x0)
+        print(f"Root found using Newton-Raphson Method: {root_newton}")
+    except ValueError as e:
+        print(e)
 
-try:
-    root_newton = newton_raphson_method(f, f_prime, x0=x0)
-    print(f"Root found using Newton-Raphson Method: {root_newton}")
-except ValueError as e:
-    print(e)
+    try:
+        integral_simpsons = simpsons_rule(f, a_simpson, b_simpson, n=n)
+        print(f"Integral computed using Simpson's Rule: {integral_simpsons}")
+    except ValueError as e:
+        print(e)
 
-try:
-    integral_simpsons = simpsons_rule(f, a_simpson, b_simpson, n=n)
-    print(f"Integral computed using Simpson's Rule: {integral_simpsons}")
-except ValueError as e:
-    print(e)
+    x_euler, y_euler = euler_method(lambda x, y: x + y, y0=y0, x0=x0_euler_rk, x_end=x_end, h=h)
+    print(f"Euler Method Results: x={x_euler}, y={y_euler}")
 
-x_euler, y_euler = euler_method(lambda x, y: x + y, y0=y0, x0=x0_euler_rk, x_end=x_end, h=h)
-print(f"Euler Method Results: x={x_euler}, y={y_euler}")
+    x_rk, y_rk = runge_kutta_4(lambda x, y: x + y, y0=y0, x0=x0_euler_rk, x_end=x_end, h=h)
+    print(f"Runge-Kutta Method Results: x={x_rk}, y={y_rk}")
 
-x_rk, y_rk = runge_kutta_4(lambda x, y: x + y, y0=y0, x0=x0_euler_rk, x_end=x_end, h=h)
-print(f"Runge-Kutta Method Results: x={x_rk}, y={y_rk}")
+    return x_euler, y_euler, x_rk, y_rk
 
 
 # Plot Results
 def plot_results(x, y, title):
-    plt.figure()
-    plt.plot(x, y, 'o-', label=title)
-    plt.xlabel('x')
-    plt.ylabel('y')
-    plt.title(title)
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    # Downsampled to the screen width and drawn on one reused figure.
+    plot_trajectory(x, y, title)
+
+
+def main():
+    x_euler, y_euler, x_rk, y_rk = solve_all()
+
+    # Plot Euler Method Results
+    plot_results(x_euler, y_euler, "Euler Method")
 
+    # Plot Runge-Kutta Method Results
+    plot_results(x_rk, y_rk, "Runge-Kutta Method")
 
-# Plot Euler Method Results
-plot_results(x_euler, y_euler, "Euler Method")
 
-# Plot Runge-Kutta Method Results
-plot_results(x_rk, y_rk, "Runge-Kutta Method")
+if __name__ == "__main__":
+    main()
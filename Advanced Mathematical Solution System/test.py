@@ -1,15 +1,37 @@
+import os
+import sys
+
+# The shared numerical_methods package lives in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import customtkinter
 from tkinter import messagebox
-import sympy as sp
 import numpy as np
-import matplotlib.pyplot as plt
+
+from numerical_methods.adaptive_ode import dormand_prince
+from numerical_methods.background_jobs import BackgroundJobRunner
+from numerical_methods.expression_cache import compile_expression
+from numerical_methods.plotting import plot_trajectory
+from numerical_methods.result_cache import open_cache
+from numerical_methods.streaming_quadrature import simpsons_rule_streaming
+
+# Solver loops report progress (and check for cancellation) this often.
+PROGRESS_INTERVAL = 1000
+
+
+def progress_interval(iterations):
+    """Iterations between progress reports: about a hundred per run, at most PROGRESS_INTERVAL."""
+    return max(1, min(PROGRESS_INTERVAL, iterations // 100))
 
 
 # --- Calculation Methods --- #
-def bisection_method(f, a, b, tol=1e-6, max_iter=100):
+def bisection_method(f, a, b, tol=1e-6, max_iter=100, progress=None):
     if f(a) * f(b) >= 0:
         raise ValueError("Function has the same signs at the endpoints.")
-    for _ in range(max_iter):
+    every = progress_interval(max_iter)
+    for i in range(max_iter):
+        if progress is not None and i % every == 0:
+            progress(i / max_iter)
         c = (a + b) / 2
         if abs(f(c)) < tol:
             return c
@@ -20,9 +42,12 @@ def bisection_method(f, a, b, tol=1e-6, max_iter=100):
     raise ValueError("Maximum iterations exceeded.")
 
 
-def newton_raphson_method(f, f_prime, x0, tol=1e-6, max_iter=100):
+def newton_raphson_method(f, f_prime, x0, tol=1e-6, max_iter=100, progress=None):
     x = x0
-    for _ in range(max_iter):
+    every = progress_interval(max_iter)
+    for i in range(max_iter):
+        if progress is not None and i % every == 0:
+            progress(i / max_iter)
         x_new = x - f(x) / f_prime(x)
         if abs(x_new - x) < tol:
             return x_new
@@ -40,20 +65,24 @@ def simpsons_rule(f, a, b, n):
     return integral
 
 
-def euler_method(f, y0, x0, x_end, h):
+def euler_method(f, y0, x0, x_end, h, progress=None):
     x = np.arange(x0, x_end, h)
     y = np.zeros(len(x))
     y[0] = y0
     for i in range(1, len(x)):
+        if progress is not None and i % PROGRESS_INTERVAL == 0:
+            progress(i / len(x))
         y[i] = y[i - 1] + h * f(x[i - 1], y[i - 1])
     return x, y
 
 
-def runge_kutta_4(f, y0, x0, x_end, h):
+def runge_kutta_4(f, y0, x0, x_end, h, progress=None):
     x = np.arange(x0, x_end, h)
     y = np.zeros(len(x))
     y[0] = y0
     for i in range(1, len(x)):
+        if progress is not None and i % PROGRESS_INTERVAL == 0:
+            progress(i / len(x))
         k1 = h * f(x[i - 1], y[i - 1])
         k2 = h * f(x[i - 1] + h / 2, y[i - 1] + k1 / 2)
         k3 = h * f(x[i - 1] + h / 2, y[i - 1] + k2 / 2)
@@ -64,124 +93,180 @@ def runge_kutta_4(f, y0, x0, x_end, h):
 
 # --- Input Parsing --- #
 def parse_expression(expr):
-    x = sp.Symbol('x')
-    return sp.lambdify(x, sp.sympify(expr), 'numpy')
+    return compile_expression(expr, ('x',)).func
 
 
 # --- Plot Results --- #
 def plot_results(x, y, title):
-    plt.figure()
-    plt.plot(x, y, 'o-', label=title)
-    plt.xlabel('x')
-    plt.ylabel('y')
-    plt.title(title)
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    # Downsampled to the screen width and drawn on one reused figure.
+    plot_trajectory(x, y, title)
 
 
 # --- GUI Implementation --- #
+def cached_job(method, expr, params, job):
+    # Reuse a stored result unless the cache is off or bypassed
+    if not result_cache.enabled or bypass_cache.get():
+        return job
+    return lambda progress: result_cache.get_or_compute(f'test.{method}', expr, params, lambda: job(progress))
+
+
 def calculate_method(selected_method):
-    # Fetch user inputs
+    # Fetch user inputs on the main thread; parsing and solving run on the background worker
     expr = entry_func.get()
     a = entry1.get()
     b = entry2.get()
 
     try:
-        # Parse the function expression
-        f = parse_expression(expr)
-
         # Handle different methods
         if selected_method == "Bisection Method":
             a = float(a)
             b = float(b)
-            root = bisection_method(f, a, b)
-            messagebox.showinfo("Result", f"Bisection Method Root: {root}")
+            job = lambda progress: bisection_method(parse_expression(expr), a, b, progress=progress)
+            cache_expr, params = expr, {'a': a, 'b': b}
+            show = lambda root: messagebox.showinfo("Result", f"Bisection Method Root: {root}")
 
         elif selected_method == "Newton-Raphson Method":
             x0 = float(a)
-            f_prime = parse_expression(entry_prime.get())
-            root = newton_raphson_method(f, f_prime, x0)
-            messagebox.showinfo("Result", f"Newton-Raphson Method Root: {root}")
+            expr_prime = entry_prime.get()
+            job = lambda progress: newton_raphson_method(parse_expression(expr), parse_expression(expr_prime), x0,
+                                                         progress=progress)
+            cache_expr, params = [expr, expr_prime], {'x0': x0}
+            show = lambda root: messagebox.showinfo("Result", f"Newton-Raphson Method Root: {root}")
 
         elif selected_method == "Runge-Kutta Method":
             y0 = float(entry_y0.get())
             x0 = float(entry_x0.get())
             x_end = float(entry_x_end.get())
             h = float(entry_h.get())
-            x, y = runge_kutta_4(f, y0, x0, x_end, h)
-            plot_results(x, y, "Runge-Kutta Method")
+            job = lambda progress: runge_kutta_4(compile_expression(expr, ('x', 'y')).func, y0, x0, x_end, h, progress)
+            cache_expr, params = expr, {'y0': y0, 'x0': x0, 'x_end': x_end, 'h': h}
+            show = lambda result: plot_results(*result, "Runge-Kutta Method")
+
+        elif selected_method == "Dormand-Prince Method":
+            y0 = float(entry_y0.get())
+            x0 = float(entry_x0.get())
+            x_end = float(entry_x_end.get())
+            job = lambda progress: dormand_prince(compile_expression(expr, ('x', 'y')).func, y0, x0, x_end,
+                                                  progress=progress)
+            cache_expr, params = expr, {'y0': y0, 'x0': x0, 'x_end': x_end}
+            show = show_dormand_prince
 
         elif selected_method == "Simpson's Rule":
             a = float(a)
             b = float(b)
             n = int(entry_n.get())
-            integral = simpsons_rule(f, a, b, n)
-            messagebox.showinfo("Result", f"Simpson's Rule Integral: {integral}")
+            job = lambda progress: simpsons_rule_streaming(parse_expression(expr), a, b, n, progress=progress)
+            cache_expr, params = expr, {'a': a, 'b': b, 'n': n}
+            show = lambda integral: messagebox.showinfo("Result", f"Simpson's Rule Integral: {integral}")
 
         elif selected_method == "Euler Method":
             y0 = float(entry_y0.get())
             x0 = float(entry_x0.get())
             x_end = float(entry_x_end.get())
             h = float(entry_h.get())
-            x, y = euler_method(f, y0, x0, x_end, h)
-            plot_results(x, y, "Euler Method")
+            job = lambda progress: euler_method(compile_expression(expr, ('x', 'y')).func, y0, x0, x_end, h, progress)
+            cache_expr, params = expr, {'y0': y0, 'x0': x0, 'x_end': x_end, 'h': h}
+            show = lambda result: plot_results(*result, "Euler Method")
+
+        else:
+            return
 
     except ValueError as e:
         messagebox.showerror("Error", str(e))
+        return
+
+    def on_done(result):
+        status_label.configure(text=f"{selected_method}: done")
+        show(result)
+
+    def on_error(e):
+        status_label.configure(text=f"{selected_method}: failed")
+        messagebox.showerror("Error", str(e))
+
+    status_label.configure(text=f"{selected_method}: running...")
+    runner.submit(cached_job(selected_method, cache_expr, params, job), on_done, on_error,
+                  on_progress=lambda fraction: status_label.configure(text=f"{selected_method}: {fraction:.0%}"))
+
+
+def cancel_method():
+    if runner.busy:
+        runner.cancel()
+        status_label.configure(text="Cancelled")
+
+
+def show_dormand_prince(result):
+    messagebox.showinfo("Result", f"Dormand-Prince Method: {result.accepted_steps} accepted steps, "
+                                  f"{result.rejected_steps} rejected, {result.evaluations} evaluations")
+    plot_results(result.x, result.y, "Dormand-Prince Method")
 
 
 # --- Create GUI --- #
-customtkinter.set_appearance_mode("dark")
-customtkinter.set_default_color_theme("green")
+if __name__ == '__main__':
+    customtkinter.set_appearance_mode("dark")
+    customtkinter.set_default_color_theme("green")
+
+    root = customtkinter.CTk()
+    root.geometry("500x600")
+
+    frame = customtkinter.CTkFrame(master=root)
+    frame.pack(pady=20, padx=60, fill="both", expand=True)
+
+    label = customtkinter.CTkLabel(master=frame, text="Select Calculation Method", font=("Roboto", 18))
+    label.pack(pady=12, padx=10)
 
-root = customtkinter.CTk()
-root.geometry("500x600")
+    # Entry for the function expression
+    entry_func = customtkinter.CTkEntry(master=frame, placeholder_text="Enter function f(x)")
+    entry_func.pack(pady=12, padx=10)
 
-frame = customtkinter.CTkFrame(master=root)
-frame.pack(pady=20, padx=60, fill="both", expand=True)
+    # Entry for the first and second input (a and b or x0)
+    entry1 = customtkinter.CTkEntry(master=frame, placeholder_text="Input First Number (a or x0)")
+    entry1.pack(pady=12, padx=10)
 
-label = customtkinter.CTkLabel(master=frame, text="Select Calculation Method", font=("Roboto", 18))
-label.pack(pady=12, padx=10)
+    entry2 = customtkinter.CTkEntry(master=frame, placeholder_text="Input Second Number (b)")
+    entry2.pack(pady=12, padx=10)
 
-# Entry for the function expression
-entry_func = customtkinter.CTkEntry(master=frame, placeholder_text="Enter function f(x)")
-entry_func.pack(pady=12, padx=10)
+    # Option menu to select the method
+    method_options = ["Bisection Method", "Newton-Raphson Method", "Runge-Kutta Method", "Dormand-Prince Method",
+                      "Simpson's Rule", "Euler Method"]
+    optionmenu = customtkinter.CTkOptionMenu(master=frame, values=method_options)
+    optionmenu.pack(pady=12, padx=10)
+    optionmenu.set("Select Method")
 
-# Entry for the first and second input (a and b or x0)
-entry1 = customtkinter.CTkEntry(master=frame, placeholder_text="Input First Number (a or x0)")
-entry1.pack(pady=12, padx=10)
+    # Entries for additional input like derivative (Newton), y0, step size, etc.
+    entry_prime = customtkinter.CTkEntry(master=frame, placeholder_text="Enter f'(x) (for Newton-Raphson)")
+    entry_prime.pack(pady=12, padx=10)
 
-entry2 = customtkinter.CTkEntry(master=frame, placeholder_text="Input Second Number (b)")
-entry2.pack(pady=12, padx=10)
+    entry_y0 = customtkinter.CTkEntry(master=frame, placeholder_text="Enter y0 (for Euler/Runge-Kutta)")
+    entry_y0.pack(pady=12, padx=10)
 
-# Option menu to select the method
-method_options = ["Bisection Method", "Newton-Raphson Method", "Runge-Kutta Method", "Simpson's Rule", "Euler Method"]
-optionmenu = customtkinter.CTkOptionMenu(master=frame, values=method_options)
-optionmenu.pack(pady=12, padx=10)
-optionmenu.set("Select Method")
+    entry_x0 = customtkinter.CTkEntry(master=frame, placeholder_text="Enter x0 (for Euler/Runge-Kutta)")
+    entry_x0.pack(pady=12, padx=10)
 
-# Entries for additional input like derivative (Newton), y0, step size, etc.
-entry_prime = customtkinter.CTkEntry(master=frame, placeholder_text="Enter f'(x) (for Newton-Raphson)")
-entry_prime.pack(pady=12, padx=10)
+    entry_x_end = customtkinter.CTkEntry(master=frame, placeholder_text="Enter x_end (for Euler/Runge-Kutta)")
+    entry_x_end.pack(pady=12, padx=10)
 
-entry_y0 = customtkinter.CTkEntry(master=frame, placeholder_text="Enter y0 (for Euler/Runge-Kutta)")
-entry_y0.pack(pady=12, padx=10)
+    entry_h = customtkinter.CTkEntry(master=frame, placeholder_text="Enter step size (h)")
+    entry_h.pack(pady=12, padx=10)
 
-entry_x0 = customtkinter.CTkEntry(master=frame, placeholder_text="Enter x0 (for Euler/Runge-Kutta)")
-entry_x0.pack(pady=12, padx=10)
+    entry_n = customtkinter.CTkEntry(master=frame, placeholder_text="Enter number of intervals (n) (for Simpson)")
+    entry_n.pack(pady=12, padx=10)
 
-entry_x_end = customtkinter.CTkEntry(master=frame, placeholder_text="Enter x_end (for Euler/Runge-Kutta)")
-entry_x_end.pack(pady=12, padx=10)
+    # Button to trigger the calculation
+    runner = BackgroundJobRunner(root)
+    button = customtkinter.CTkButton(master=frame, text="Calculate", command=lambda: calculate_method(optionmenu.get()))
+    button.pack(pady=12, padx=10)
 
-entry_h = customtkinter.CTkEntry(master=frame, placeholder_text="Enter step size (h)")
-entry_h.pack(pady=12, padx=10)
+    # Button to cancel a running calculation
+    cancel_button = customtkinter.CTkButton(master=frame, text="Cancel", command=cancel_method)
+    cancel_button.pack(pady=12, padx=10)
 
-entry_n = customtkinter.CTkEntry(master=frame, placeholder_text="Enter number of intervals (n) (for Simpson)")
-entry_n.pack(pady=12, padx=10)
+    status_label = customtkinter.CTkLabel(master=frame, text="Ready")
+    status_label.pack(pady=12, padx=10)
 
-# Button to trigger the calculation
-button = customtkinter.CTkButton(master=frame, text="Calculate", command=lambda: calculate_method(optionmenu.get()))
-button.pack(pady=12, padx=10)
+    # Results of repeated solves are reused when $NUMERICAL_METHODS_CACHE is set
+    result_cache = open_cache()
+    bypass_cache = customtkinter.BooleanVar(value=False)
+    if result_cache.enabled:
+        customtkinter.CTkCheckBox(master=frame, text="Bypass result cache", variable=bypass_cache).pack(pady=12, padx=10)
 
-root.mainloop()
+    root.mainloop()
@@ -0,0 +1,446 @@
+"""Benchmark every solver implementation on a fixed corpus of problems.
+
+The root finders, Simpson's rule and the Euler / RK4 integrators exist in
+several divergent copies (gui.py and the scripts in "Advanced Mathematical
+Solution System/") next to the shared numerical_methods package.  This
+harness runs all of them on the same expressions and problem sizes and
+records, per implementation and case:
+
+* time         best wall time of one call, in seconds
+* evaluations  points at which f (or f') was evaluated; a call on an array
+               counts every element and a fused f/f' call counts once
+* iterations   root finders: new abscissae beyond the starting points;
+               ODE solvers: steps taken; otherwise null
+* error        absolute error against the reference value
+
+Run from the repository root:
+
+    python benchmarks/bench_solvers.py run -o results.json
+    python benchmarks/bench_solvers.py compare base.json results.json
+
+`compare` prints every case that got slower, less accurate or needs more
+evaluations and exits with status 1 if there is any such regression.
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = os.path.join(ROOT, 'Advanced Mathematical Solution System')
+sys.path.insert(0, ROOT)
+
+from numerical_methods.expression_cache import compile_expression
+
+RootProblem = namedtuple('RootProblem', ['expr', 'a', 'b', 'x0', 'root'])
+IntegralProblem = namedtuple('IntegralProblem', ['expr', 'a', 'b', 'integral'])
+OdeProblem = namedtuple('OdeProblem', ['expr', 'y0', 'x0', 'x_end', 'solution'])
+
+ROOT_PROBLEMS = [
+    RootProblem('x**3 - x - 2', 1.0, 2.0, 1.5, 1.5213797068045676),
+    RootProblem('cos(x) - x', 0.0, 1.0, 0.5, 0.7390851332151607),
+    RootProblem('exp(x) - 3', 0.0, 2.0, 1.0, math.log(3)),
+    RootProblem('x**2 - 2', 0.0, 2.0, 1.0, math.sqrt(2)),
+]
+INTEGRAL_PROBLEMS = [
+    IntegralProblem('sin(x)', 0.0, math.pi, 2.0),
+    IntegralProblem('exp(-x**2)', 0.0, 1.0, math.sqrt(math.pi) / 2 * math.erf(1)),
+    IntegralProblem('1/(1 + x**2)', 0.0, 1.0, math.pi / 4),
+    IntegralProblem('x**3 - x - 2', 0.0, 2.0, -2.0),
+]
+# dy/dx = expr with its exact solution y(x).
+ODE_PROBLEMS = [
+    OdeProblem('x + y', 1.0, 0.0, 1.0, lambda x: 2 * math.exp(x) - x - 1),
+    OdeProblem('-2*x*y', 1.0, 0.0, 2.0, lambda x: math.exp(-x ** 2)),
+    OdeProblem('y*cos(x)', 1.0, 0.0, 3.0, lambda x: math.exp(math.sin(x))),
+    # Stiff: explicit methods are unstable at h = 0.1.
+    OdeProblem('-1000*(y - cos(x))', 0.0, 0.0, 2.0,
+               lambda x: (1e6 * math.cos(x) + 1e3 * math.sin(x) - 1e6 * math.exp(-1e3 * x)) / (1e6 + 1)),
+]
+
+ROOT_TOLERANCE = 1e-10
+MAX_ITERATIONS = 100
+SIMPSON_INTERVALS = (100, 10000)
+STEP_SIZES = (0.1, 0.001)
+ADAPTIVE_TOLERANCES = (1e-6, 1e-10)
+
+
+def _load_script(path):
+    """Import a script by path under a private name (test.py would clash with the stdlib)."""
+    name = '_bench_' + os.path.splitext(os.path.basename(path))[0]
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return sys.modules[name]
+
+
+def _script_copies():
+    copies = [('gui', os.path.join(ROOT, 'gui.py'))]
+    for name in ('cli_solver', 'methods_call', 'integration', 'test'):
+        copies.append((name, os.path.join(SCRIPTS, name + '.py')))
+    return copies
+
+
+class _Counter:
+    """Counts evaluations of wrapped callables and remembers scalar abscissae."""
+
+    def __init__(self):
+        self.evaluations = 0
+        self.points = set()
+
+    def wrap(self, func):
+        def counted(x, *args):
+            size = np.size(x)
+            self.evaluations += size
+            if size == 1:
+                self.points.add(float(np.ravel(x)[0]))
+            return func(x, *args)
+        return counted
+
+
+class _CountingExpression:
+    """Stand-in for a CompiledExpression whose callables report to a _Counter."""
+
+    def __init__(self, compiled, counter):
+        self._compiled = compiled
+        self._counter = counter
+
+    @property
+    def func(self):
+        return self._counter.wrap(self._compiled.func)
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+    def derivative(self, *args, **kwargs):
+        return self._counter.wrap(self._compiled.derivative(*args, **kwargs))
+
+    def fused(self, *args, **kwargs):
+        return self._counter.wrap(self._compiled.fused(*args, **kwargs))
+
+    def __getattr__(self, attr):
+        return getattr(self._compiled, attr)
+
+
+class _counting_compiler:
+    """Context manager routing `module.compile_expression` through a _Counter."""
+
+    def __init__(self, modules, counter):
+        self.modules = modules
+        self.counter = counter
+
+    def __enter__(self):
+        def compile_counted(*args, **kwargs):
+            return _CountingExpression(compile_expression(*args, **kwargs), self.counter)
+        self.saved = [module.compile_expression for module in self.modules]
+        for module in self.modules:
+            module.compile_expression = compile_counted
+        return self.counter
+
+    def __exit__(self, *exc):
+        for module, saved in zip(self.modules, self.saved):
+            module.compile_expression = saved
+
+
+# Each implementation is (method, implementation label, kind, modules, run).
+# `run(problem, size, f, f_prime)` solves one case; `f` / `f_prime` are the
+# compiled callables for implementations that take functions, and `modules`
+# lists the modules whose compile_expression is counted for those that take
+# expression strings.
+Implementation = namedtuple('Implementation', ['method', 'name', 'kind', 'modules', 'run'])
+
+
+def _implementations():
+    """All implementations importable here, and the ones that are not."""
+    found = []
+    unavailable = {}
+
+    for name, path in _script_copies():
+        try:
+            module = _load_script(path)
+        except Exception as e:
+            unavailable[name] = f"{type(e).__name__}: {e}"
+            continue
+        if name == 'gui':
+            found += [
+                Implementation('bisection', name, 'root', [module], lambda p, s, f, fp, m=module:
+                               m.bisection_method(p.a, p.b, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr)),
+                Implementation('newton', name, 'root', [module], lambda p, s, f, fp, m=module:
+                               m.newton_raphson_method(p.x0, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr)),
+                Implementation('euler', name, 'ode', [module], lambda p, s, f, fp, m=module:
+                               m.euler_method(p.x0, p.y0, s, p.x_end, p.expr)),
+                Implementation('runge_kutta_4', name, 'ode', [module], lambda p, s, f, fp, m=module:
+                               m.runge_kutta_method(p.x0, p.y0, s, p.x_end, p.expr)),
+            ]
+            continue
+        found += [
+            Implementation('bisection', name, 'root', [], lambda p, s, f, fp, m=module:
+                           m.bisection_method(f, p.a, p.b, ROOT_TOLERANCE, MAX_ITERATIONS)),
+            Implementation('newton', name, 'root', [], lambda p, s, f, fp, m=module:
+                           m.newton_raphson_method(f, fp, p.x0, ROOT_TOLERANCE, MAX_ITERATIONS)),
+            Implementation('simpson', name, 'simpson', [], lambda p, s, f, fp, m=module:
+                           m.simpsons_rule(f, p.a, p.b, s)),
+            Implementation('euler', name, 'ode', [], lambda p, s, f, fp, m=module:
+                           m.euler_method(f, p.y0, p.x0, p.x_end, s)),
+            Implementation('runge_kutta_4', name, 'ode', [], lambda p, s, f, fp, m=module:
+                           m.runge_kutta_4(f, p.y0, p.x0, p.x_end, s)),
+        ]
+
+    import brent_method
+    import false_position_method
+    import secant_method
+    from numerical_methods import adaptive_ode, adaptive_quadrature, batch_roots, ensemble_ode
+    from numerical_methods import romberg, stiff_ode, streaming_quadrature
+
+    found += [
+        Implementation('bisection', 'batch_roots', 'root', [batch_roots], lambda p, s, f, fp:
+                       float(batch_roots.batch_bisection(p.a, p.b, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr).roots)),
+        Implementation('newton', 'batch_roots', 'root', [batch_roots], lambda p, s, f, fp:
+                       float(batch_roots.batch_newton(p.x0, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr).roots)),
+        Implementation('secant', 'secant_method', 'root', [secant_method], lambda p, s, f, fp:
+                       secant_method.secant_method(p.a, p.b, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr)),
+        Implementation('false_position', 'false_position_method', 'root', [false_position_method],
+                       lambda p, s, f, fp: false_position_method.false_position_method(
+                           p.a, p.b, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr)),
+        Implementation('illinois', 'false_position_method', 'root', [false_position_method],
+                       lambda p, s, f, fp: false_position_method.illinois_method(
+                           p.a, p.b, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr)),
+        Implementation('brent', 'brent_method', 'root', [brent_method], lambda p, s, f, fp:
+                       brent_method.brent_method(p.a, p.b, ROOT_TOLERANCE, MAX_ITERATIONS, p.expr)),
+        Implementation('simpson', 'streaming_quadrature', 'simpson', [], lambda p, s, f, fp:
+                       streaming_quadrature.simpsons_rule_streaming(f, p.a, p.b, s)),
+        Implementation('adaptive_simpson', 'adaptive_quadrature', 'adaptive_integral', [], lambda p, s, f, fp:
+                       adaptive_quadrature.adaptive_simpson(f, p.a, p.b, s).integral),
+        Implementation('gauss_kronrod', 'adaptive_quadrature', 'adaptive_integral', [], lambda p, s, f, fp:
+                       adaptive_quadrature.gauss_kronrod(f, p.a, p.b, s).integral),
+        Implementation('romberg', 'romberg', 'adaptive_integral', [], lambda p, s, f, fp:
+                       romberg.romberg(f, p.a, p.b, s)),
+        Implementation('euler', 'ensemble_ode', 'ode', [ensemble_ode], lambda p, s, f, fp:
+                       ensemble_ode.ensemble_euler(p.expr, p.y0, p.x0, p.x_end, s)),
+        Implementation('runge_kutta_4', 'ensemble_ode', 'ode', [ensemble_ode], lambda p, s, f, fp:
+                       ensemble_ode.ensemble_runge_kutta_4(p.expr, p.y0, p.x0, p.x_end, s)),
+        Implementation('dormand_prince', 'adaptive_ode', 'adaptive_ode', [], lambda p, s, f, fp:
+                       adaptive_ode.dormand_prince(f, p.y0, p.x0, p.x_end, rtol=s, atol=s)),
+        Implementation('backward_euler', 'stiff_ode', 'ode', [stiff_ode], lambda p, s, f, fp:
+                       stiff_ode.backward_euler(p.expr, p.y0, p.x0, p.x_end, s)[:2]),
+        Implementation('bdf2', 'stiff_ode', 'ode', [stiff_ode], lambda p, s, f, fp:
+                       stiff_ode.bdf2(p.expr, p.y0, p.x0, p.x_end, s)[:2]),
+        Implementation('rosenbrock', 'stiff_ode', 'ode', [stiff_ode], lambda p, s, f, fp:
+                       stiff_ode.rosenbrock(p.expr, p.y0, p.x0, p.x_end, s)[:2]),
+    ]
+    return found, unavailable
+
+
+# Problem corpus, size parameter name and sizes for every kind of method.
+KINDS = {
+    'root': (ROOT_PROBLEMS, 'tolerance', (ROOT_TOLERANCE,)),
+    'simpson': (INTEGRAL_PROBLEMS, 'n', SIMPSON_INTERVALS),
+    'adaptive_integral': (INTEGRAL_PROBLEMS, 'tolerance', ADAPTIVE_TOLERANCES),
+    'ode': (ODE_PROBLEMS, 'h', STEP_SIZES),
+    'adaptive_ode': (ODE_PROBLEMS, 'tolerance', ADAPTIVE_TOLERANCES),
+}
+
+
+def _score(kind, problem, result, counter):
+    """Error against the reference and iteration count for one solver result."""
+    if kind == 'root':
+        start = {problem.a, problem.b, problem.x0}
+        return abs(float(result) - problem.root), len(counter.points - start)
+    if kind in ('simpson', 'adaptive_integral'):
+        return abs(float(result) - problem.integral), None
+    if kind == 'adaptive_ode':
+        x, y, steps = result.x, result.y, result.accepted_steps
+    else:
+        x, y = result
+        steps = len(x) - 1
+    x_last = float(x[-1])
+    y_last = float(np.ravel(y[-1])[0])
+    return abs(y_last - problem.solution(x_last)), steps
+
+
+def _best_time(call, repeat, min_time=0.02):
+    """Best time of one call, looping each measurement for at least `min_time`."""
+    start = time.perf_counter()
+    call()
+    once = time.perf_counter() - start
+    number = max(1, int(min_time / max(once, 1e-9)))
+    best = once
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_case(implementation, problem, size, repeat=3):
+    """Benchmark one implementation on one problem; returns a result record."""
+    variables = ('x', 'y') if implementation.kind in ('ode', 'adaptive_ode') else ('x',)
+    compiled = compile_expression(problem.expr, variables)
+    f = compiled.func
+    f_prime = compiled.derivative() if implementation.kind == 'root' else None
+    parameter = KINDS[implementation.kind][1]
+    record = {
+        'method': implementation.method,
+        'implementation': implementation.name,
+        'problem': problem.expr,
+        'size': {parameter: size},
+        'status': 'ok',
+        'time': None,
+        'evaluations': None,
+        'iterations': None,
+        'error': None,
+    }
+
+    counter = _Counter()
+    try:
+        with _counting_compiler(implementation.modules, counter):
+            result = implementation.run(problem, size, counter.wrap(f),
+                                        counter.wrap(f_prime) if f_prime is not None else None)
+        record['time'] = _best_time(lambda: implementation.run(problem, size, f, f_prime), repeat)
+    except Exception as e:
+        record['status'] = f"{type(e).__name__}: {e}"
+        return record
+
+    error, iterations = _score(implementation.kind, problem, result, counter)
+    record.update(evaluations=counter.evaluations, iterations=iterations,
+                  error=error if math.isfinite(error) else None)
+    if not math.isfinite(error):
+        record['status'] = 'non-finite result'
+    return record
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(repeat=3, only=None, progress=None):
+    """Run the whole corpus; `only` restricts to methods or implementations by name."""
+    implementations, unavailable = _implementations()
+    results = []
+    for implementation in implementations:
+        if only and implementation.method not in only and implementation.name not in only:
+            continue
+        problems, _, sizes = KINDS[implementation.kind]
+        for problem in problems:
+            for size in sizes:
+                record = run_case(implementation, problem, size, repeat)
+                results.append(record)
+                if progress is not None:
+                    progress(record)
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'unavailable': unavailable,
+        'results': results,
+    }
+
+
+def case_key(record):
+    size = ','.join(f"{k}={v:g}" for k, v in sorted(record['size'].items()))
+    return record['method'], record['implementation'], record['problem'], size
+
+
+def compare(base, new, time_threshold=0.25, error_threshold=0.1, error_floor=1e-14):
+    """Regressions of `new` relative to `base` as (key, description) pairs.
+
+    A case regresses when it now fails, is more than `time_threshold`
+    slower, needs more evaluations, or its error grew by more than
+    `error_threshold` (relative) and is above `error_floor`.
+    """
+    base_cases = {case_key(r): r for r in base['results']}
+    regressions = []
+    for record in new['results']:
+        key = case_key(record)
+        old = base_cases.get(key)
+        if old is None or old['status'] != 'ok':
+            continue
+        if record['status'] != 'ok':
+            regressions.append((key, f"now fails: {record['status']}"))
+            continue
+        if record['time'] > old['time'] * (1 + time_threshold):
+            regressions.append((key, f"time {old['time']:.3g}s -> {record['time']:.3g}s "
+                                     f"({record['time'] / old['time']:.2f}x)"))
+        if record['evaluations'] > old['evaluations']:
+            regressions.append((key, f"evaluations {old['evaluations']} -> {record['evaluations']}"))
+        if record['error'] > max(old['error'] * (1 + error_threshold), error_floor):
+            regressions.append((key, f"error {old['error']:.3g} -> {record['error']:.3g}"))
+    return regressions
+
+
+def _format_key(key):
+    method, implementation, problem, size = key
+    return f"{method:16} {implementation:22} {problem:18} {size:16}"
+
+
+def _print_record(record):
+    def number(value, spec, width):
+        return format(value, f">{width}{spec}") if value is not None else '-'.rjust(width)
+    print(f"{_format_key(case_key(record))} {number(record['time'], '.3g', 10)} "
+          f"{number(record['evaluations'], '', 9)} {number(record['iterations'], '', 6)} "
+          f"{number(record['error'], '.2e', 10)}  {'' if record['status'] == 'ok' else record['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='run the benchmark corpus')
+    run.add_argument('-o', '--output', help='write the results as JSON to this file')
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--only', nargs='+', help='methods or implementations to run')
+    diff = commands.add_parser('compare', help='flag regressions between two result files')
+    diff.add_argument('base')
+    diff.add_argument('new')
+    diff.add_argument('--time-threshold', type=float, default=0.25)
+    diff.add_argument('--error-threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        print(f"{'method':16} {'implementation':22} {'problem':18} {'size':16} {'time/s':>10} "
+              f"{'evals':>9} {'iters':>6} {'error':>10}")
+        report = run_suite(args.repeat, args.only, progress=_print_record)
+        for name, reason in report['unavailable'].items():
+            print(f"skipped {name}: {reason}")
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump(report, file, indent=1)
+        return 0
+
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+    regressions = compare(base, new, args.time_threshold, args.error_threshold)
+    for key, description in regressions:
+        print(f"REGRESSION {_format_key(key)} {description}")
+    print(f"{len(regressions)} regression(s) in {len(new['results'])} cases.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
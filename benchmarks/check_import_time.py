@@ -0,0 +1,83 @@
+"""Check that importing the core solvers stays within the import-time budget.
+
+Each measurement runs in a fresh interpreter so nothing is already cached
+in sys.modules.  The check fails (exit status 1) when the best of several
+runs exceeds the budget or when NumPy / SymPy were loaded eagerly.
+
+Run from the repository root:  python benchmarks/check_import_time.py [--budget-ms 50]
+tests/test_import_time.py runs the same check under pytest.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = 50.0
+
+# The solver modules the front ends import at start-up.
+CORE_MODULES = [
+    'numerical_methods',
+    'numerical_methods.expression_cache',
+    'numerical_methods.batch_roots',
+    'numerical_methods.root_scan',
+    'numerical_methods.adaptive_ode',
+    'numerical_methods.adaptive_quadrature',
+    'numerical_methods.romberg',
+    'numerical_methods.streaming_quadrature',
+    'numerical_methods.ode_systems',
+    'numerical_methods.ensemble_ode',
+    'numerical_methods.high_precision',
+    'numerical_methods.newton_system',
+    'numerical_methods.parameter_sweep',
+    'numerical_methods.result_cache',
+    'numerical_methods.scalar_roots',
+]
+HEAVY_MODULES = ['numpy', 'sympy', 'scipy', 'matplotlib', 'mpmath']
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(','.join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(modules, repeat=5):
+    """Best import time in ms over `repeat` fresh interpreters and the heavy modules loaded."""
+    probe = _PROBE.format(modules=modules, heavy=HEAVY_MODULES)
+    best = None
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.split('\n')
+        elapsed = float(output[0])
+        loaded = [name for name in output[1].split(',') if name]
+        best = elapsed if best is None else min(best, elapsed)
+    return best, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    elapsed, loaded = measure(CORE_MODULES, args.repeat)
+    print(f"core solvers imported in {elapsed:.1f} ms (budget {args.budget_ms:g} ms)")
+    failed = False
+    if elapsed > args.budget_ms:
+        print("FAIL: import time is over budget")
+        failed = True
+    if loaded:
+        print(f"FAIL: imported eagerly: {', '.join(loaded)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# brent_method.py
+
+import math
+import sys
+
+from numerical_methods.expression_cache import bind_parameters, compile_expression
+
+def brent_method(a, b, tolerance, max_iterations, expr, params=None):
+    a = float(a)
+    b = float(b)
+    tolerance = float(tolerance)
+    max_iterations = int(max_iterations)
+
+    f = bind_parameters(compile_expression(expr, ('x',) + tuple(params or ())).func, params)
+    fa = f(a)
+    fb = f(b)
+
+    if fa * fb >= 0:
+        raise ValueError("Function has the same sign at endpoints a and b")
+
+    # b is the best estimate, a the previous one and c the contrapoint that
+    # keeps the root bracketed.  Interpolation steps (inverse quadratic or
+    # secant) are only taken while they shrink the bracket fast enough;
+    # otherwise the step falls back to bisection.
+    c, fc = b, fb
+    d = e = 0.0
+    for _ in range(max_iterations):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol = 2 * sys.float_info.epsilon * abs(b) + tolerance / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return b
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p = 2 * m * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, m)
+        fb = f(b)
+
+    return b
@@ -1,18 +1,15 @@
 # false_position_method.py
 
-from sympy import symbols, lambdify, sympify
+from numerical_methods.expression_cache import bind_parameters, compile_expression
+from numerical_methods.scalar_roots import scalar_illinois
 
-# Define symbolic variables
-x = symbols('x')
-
-def false_position_method(a, b, tolerance, max_iterations, expr):
+def false_position_method(a, b, tolerance, max_iterations, expr, params=None):
     a = float(a)
     b = float(b)
     tolerance = float(tolerance)
     max_iterations = int(max_iterations)
-    expr = sympify(expr)
 
-    f = lambdify(x, expr, 'numpy')
+    f = bind_parameters(compile_expression(expr, ('x',) + tuple(params or ())).func, params)
     fa = f(a)
     fb = f(b)
 
@@ -34,3 +31,21 @@ def false_position_method(a, b, tolerance, max_iterations, expr):
             fa = fc
 
     return c
+
+
+def illinois_method(a, b, tolerance, max_iterations, expr, params=None):
+    a = float(a)
+    b = float(b)
+    tolerance = float(tolerance)
+    max_iterations = int(max_iterations)
+
+    f = bind_parameters(compile_expression(expr, ('x',) + tuple(params or ())).func, params)
+    fa = f(a)
+    fb = f(b)
+
+    if fa * fb >= 0:
+        raise ValueError("Function has the same sign at endpoints a and b")
+
+    # Illinois modification: the endpoint that survives two iterations in a
+    # row has its function value halved (see scalar_illinois).
+    return scalar_illinois(f, a, b, fa, fb, tolerance, max_iterations).root
@@ -1,38 +1,72 @@
+import math
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from sympy import symbols, lambdify, sympify, diff
-
-# Define symbolic variables
-x, y = symbols('x y')
+from numerical_methods.adaptive_ode import dormand_prince
+from numerical_methods.background_jobs import BackgroundJobRunner
+from numerical_methods.expression_cache import bind_parameters, compile_expression
+from numerical_methods.ode_systems import compile_system, parse_system
+from numerical_methods.plotting import LiveTrajectoryPlot, plot_trajectory
+from numerical_methods.result_cache import open_cache
+from numerical_methods.root_scan import find_all_roots
+from numerical_methods.scalar_roots import DIVERGED, ZERO_DERIVATIVE, scalar_newton
+from numerical_methods.trajectory_stream import iter_trajectory
+
+# Solver loops report progress (and check for cancellation) this often.
+PROGRESS_INTERVAL = 1000
+# Euler/RK4 trajectories longer than this are decimated for plotting.
+MAX_TRAJECTORY_POINTS = 100000
+# Upper bound on redraws per second of the live trajectory plot.
+LIVE_PLOT_FPS = 30
+live_plot = None
 
 
 def evaluate_expression(expr, value_x, value_y=None):
     """Evaluate the mathematical expression with given x and y values."""
-    func = lambdify((x, y), expr, 'numpy')
     if value_y is None:
-        return func(value_x)
-    return func(value_x, value_y)
+        return compile_expression(expr, ('x',)).func(value_x)
+    return compile_expression(expr, ('x', 'y')).func(value_x, value_y)
+
+
+def parse_parameters(text):
+    """Parse parameter values such as `a=2, b=0.5` into a dict."""
+    params = {}
+    for item in text.replace(';', ',').split(','):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition('=')
+        if not sep or not name.strip().isidentifier():
+            raise ValueError(f"Parameters must look like a=2, b=0.5, not {item.strip()!r}")
+        params[name.strip()] = float(value)
+    return params
+
 
+def progress_interval(iterations):
+    """Iterations between progress reports: about a hundred per run, at most PROGRESS_INTERVAL."""
+    return max(1, min(PROGRESS_INTERVAL, iterations // 100))
 
-def bisection_method(a, b, tolerance, max_iterations, expr):
-    """Bisection method to find the root of the function `expr`."""
+
+def bisection_method(a, b, tolerance, max_iterations, expr, progress=None, params=None):
+    """Bisection method to find the root of the function `expr`.
+
+    `params` fixes extra symbols in `expr`, e.g. `{'a': 2}`.
+    """
     a = float(a)
     b = float(b)
     tolerance = float(tolerance)
     max_iterations = int(max_iterations)
-    expr = sympify(expr)
 
-    f = lambdify(x, expr, 'numpy')
+    f = bind_parameters(compile_expression(expr, ('x',) + tuple(params or ())).func, params)
     fa = f(a)
     fb = f(b)
 
     if fa * fb >= 0:
         raise ValueError("Function has the same sign at endpoints a and b")
 
-    for _ in range(max_iterations):
+    every = progress_interval(max_iterations)
+    for i in range(max_iterations):
+        if progress is not None and i % every == 0:
+            progress(i / max_iterations)
         c = (a + b) / 2
         fc = f(c)
 
@@ -49,76 +83,109 @@ def bisection_method(a, b, tolerance, max_iterations, expr):
     return c
 
 
-def newton_raphson_method(x0, tolerance, max_iterations, expr):
-    """Newton-Raphson method to find the root of the function `expr`."""
+def newton_raphson_method(x0, tolerance, max_iterations, expr, progress=None, params=None):
+    """Newton-Raphson method to find the root of the function `expr`.
+
+    `params` fixes extra symbols in `expr`, e.g. `{'a': 2}`.
+    """
     x0 = float(x0)
     tolerance = float(tolerance)
     max_iterations = int(max_iterations)
-    expr = sympify(expr)
 
-    f = lambdify(x, expr, 'numpy')
-    f_prime = lambdify(x, diff(expr, x), 'numpy')
+    compiled = compile_expression(expr, ('x',) + tuple(params or ()))
+    f_and_prime = bind_parameters(compiled.fused(var='x'), params)
+
+    result = scalar_newton(f_and_prime, x0, tolerance, max_iterations, progress=progress,
+                           report_every=progress_interval(max_iterations))
+    if result.status == ZERO_DERIVATIVE:
+        raise ValueError("Derivative is zero. Newton-Raphson method fails.")
+    if result.status == DIVERGED:
+        raise ValueError("Newton-Raphson step is not finite. The method diverged.")
+    return result.root
+
+
+def ode_function(expr):
+    """`f(x, y)` for `dy/dx = expr`, or for a system given as a list of expressions in y1, ..., yn."""
+    if isinstance(expr, (list, tuple)):
+        return compile_system(expr)
+    return compile_expression(expr, ('x', 'y')).func
+
+
+def fixed_step_method(method, x0, y0, h, xn, expr, progress=None, trajectory=None):
+    """Integrate `dy/dx = expr` from `x0` to `xn` in steps of `h` with `method` ('euler' or 'runge_kutta_4').
+
+    `expr` may be a list of right-hand sides with one value each in `y0`.
+    The steps stream from `iter_trajectory`; runs longer than
+    MAX_TRAJECTORY_POINTS keep every n-th step and the last one, which is
+    all a plot can show.  Kept steps are appended to the lists of the
+    optional `trajectory` pair `(x_vals, y_vals)`, so a live plot can
+    follow them while they grow.
+    """
+    if h <= 0:
+        raise ValueError("Step size must be positive.")
+    f = ode_function(expr)
+    # The last step may pass xn.  iter_trajectory stops before its end
+    # point, so that lies half a step after the last step.
+    steps = max(0, math.ceil((xn - x0) / h - 1e-9))
+    keep = max(1, math.ceil((steps + 1) / MAX_TRAJECTORY_POINTS))
+    every = progress_interval(steps + 1)
+
+    x_vals, y_vals = trajectory if trajectory is not None else ([], [])
+    for i, (x, y) in enumerate(iter_trajectory(method, f, y0, x0, x0 + (steps + 0.5) * h, h)):
+        if progress is not None and i % every == 0:
+            progress(i / (steps + 1))
+        if i % keep == 0 or i == steps:
+            x_vals.append(x)
+            y_vals.append(float(y) if y.ndim == 0 else y)
 
-    for _ in range(max_iterations):
-        f_x0 = f(x0)
-        f_prime_x0 = f_prime(x0)
-
-        if f_prime_x0 == 0:
-            raise ValueError("Derivative is zero. Newton-Raphson method fails.")
-
-        x1 = x0 - f_x0 / f_prime_x0
+    return x_vals, y_vals
 
-        if abs(x1 - x0) < tolerance:
-            return x1
 
-        x0 = x1
+def euler_method(x0, y0, h, xn, expr, progress=None, trajectory=None):
+    """Euler method to solve the differential equation `dy/dx = expr` (see `fixed_step_method`)."""
+    return fixed_step_method('euler', x0, y0, h, xn, expr, progress, trajectory)
 
-    return x0
 
+def runge_kutta_method(x0, y0, h, xn, expr, progress=None, trajectory=None):
+    """Runge-Kutta method to solve the differential equation `dy/dx = expr` (see `fixed_step_method`)."""
+    return fixed_step_method('runge_kutta_4', x0, y0, h, xn, expr, progress, trajectory)
 
-def euler_method(x0, y0, h, xn, expr):
-    """Euler method to solve the differential equation `dy/dx = expr`."""
-    expr = sympify(expr)  # Convert string to sympy expression
-    f = lambdify((x, y), expr, 'numpy')
 
-    x_vals = [x0]
-    y_vals = [y0]
+def dormand_prince_method(x0, y0, xn, tolerance, expr, progress=None):
+    """Adaptive-step Dormand-Prince method for `dy/dx = expr` or a system."""
+    tolerance = float(tolerance)
+    return dormand_prince(ode_function(expr), y0, float(x0), float(xn), rtol=tolerance, atol=tolerance,
+                          progress=progress)
 
-    while x0 < xn:
-        y0 = y0 + h * f(x0, y0)
-        x0 = x0 + h
-        x_vals.append(x0)
-        y_vals.append(y0)
 
+def follow_trajectory(x0, xn, title):
+    """Start a live plot of a trajectory on the embedded canvas and return its lists."""
+    global live_plot
+    stop_live_plot()
+    x_vals, y_vals = [], []
+    live_plot = LiveTrajectoryPlot(plot_ax, x_vals, y_vals, x0, xn, title, max_fps=LIVE_PLOT_FPS)
     return x_vals, y_vals
 
 
-def runge_kutta_method(x0, y0, h, xn, expr):
-    """Runge-Kutta method to solve the differential equation `dy/dx = expr`."""
-    expr = sympify(expr)  # Convert string to sympy expression
-    f = lambdify((x, y), expr, 'numpy')
+def stop_live_plot():
+    global live_plot
+    if live_plot is not None:
+        live_plot.stop()
+        live_plot = None
 
-    x_vals = [x0]
-    y_vals = [y0]
 
-    while x0 < xn:
-        k1 = h * f(x0, y0)
-        k2 = h * f(x0 + h / 2, y0 + k1 / 2)
-        k3 = h * f(x0 + h / 2, y0 + k2 / 2)
-        k4 = h * f(x0 + h, y0 + k3)
-
-        y0 = y0 + (k1 + 2 * k2 + 2 * k3 + k4) / 6
-        x0 = x0 + h
-
-        x_vals.append(x0)
-        y_vals.append(y0)
-
-    return x_vals, y_vals
+def cached_job(method, expr, params, job):
+    """Wrap `job` to reuse a stored result unless the cache is off or bypassed."""
+    if not result_cache.enabled or bypass_cache_var.get():
+        return job
+    return lambda progress: result_cache.get_or_compute(f'gui.{method}', expr, params, lambda: job(progress))
 
 
 def run_method():
+    """Read the inputs on the main thread and solve in the background."""
     method = method_var.get()
     expr = entry_expr.get()
+    stop_live_plot()
 
     try:
         if method == 'Bisection':
@@ -126,94 +193,174 @@ def run_method():
             b = float(entry_b.get())
             tolerance = float(entry_tolerance.get())
             max_iterations = int(entry_max_iterations.get())
-            result = bisection_method(a, b, tolerance, max_iterations, expr)
-            messagebox.showinfo("Result", f"Root: {result}")
+            parameters = parse_parameters(entry_params.get())
+            job = lambda progress: bisection_method(a, b, tolerance, max_iterations, expr, progress, parameters)
+            params = {'a': a, 'b': b, 'tolerance': tolerance, 'max_iterations': max_iterations,
+                      'parameters': parameters}
+            show = lambda result: messagebox.showinfo("Result", f"Root: {result}")
         elif method == 'Newton-Raphson':
             x0 = float(entry_x0.get())
             tolerance = float(entry_tolerance.get())
             max_iterations = int(entry_max_iterations.get())
-            result = newton_raphson_method(x0, tolerance, max_iterations, expr)
-            messagebox.showinfo("Result", f"Root: {result}")
+            parameters = parse_parameters(entry_params.get())
+            job = lambda progress: newton_raphson_method(x0, tolerance, max_iterations, expr, progress, parameters)
+            params = {'x0': x0, 'tolerance': tolerance, 'max_iterations': max_iterations,
+                      'parameters': parameters}
+            show = lambda result: messagebox.showinfo("Result", f"Root: {result}")
         elif method == 'Euler':
             x0 = float(entry_x0.get())
-            y0 = float(entry_y0.get())
+            expr, y0 = parse_system(expr, entry_y0.get())
             h = float(entry_h.get())
             xn = float(entry_xn.get())
-            x, y = euler_method(x0, y0, h, xn, expr)
-            plot_graph(x, y, 'Euler\'s Method')
+            # The live plot follows a single equation; systems are plotted when done.
+            trajectory = follow_trajectory(x0, xn, 'Euler\'s Method') if isinstance(y0, float) else None
+            job = lambda progress: euler_method(x0, y0, h, xn, expr, progress, trajectory)
+            params = {'x0': x0, 'y0': y0, 'h': h, 'xn': xn}
+            show = lambda result: plot_graph(*result, 'Euler\'s Method')
         elif method == 'Runge-Kutta':
             x0 = float(entry_x0.get())
-            y0 = float(entry_y0.get())
+            expr, y0 = parse_system(expr, entry_y0.get())
             h = float(entry_h.get())
             xn = float(entry_xn.get())
-            x, y = runge_kutta_method(x0, y0, h, xn, expr)
-            plot_graph(x, y, 'Runge-Kutta Method')
+            # The live plot follows a single equation; systems are plotted when done.
+            trajectory = follow_trajectory(x0, xn, 'Runge-Kutta Method') if isinstance(y0, float) else None
+            job = lambda progress: runge_kutta_method(x0, y0, h, xn, expr, progress, trajectory)
+            params = {'x0': x0, 'y0': y0, 'h': h, 'xn': xn}
+            show = lambda result: plot_graph(*result, 'Runge-Kutta Method')
+        elif method == 'All Roots':
+            a = float(entry_a.get())
+            b = float(entry_b.get())
+            job = lambda progress: find_all_roots(expr, a, b, progress=progress)
+            params = {'a': a, 'b': b}
+            show = lambda roots: messagebox.showinfo("Result", f"Roots in [{a}, {b}]: {list(roots)}")
+        elif method == 'Dormand-Prince':
+            x0 = float(entry_x0.get())
+            expr, y0 = parse_system(expr, entry_y0.get())
+            xn = float(entry_xn.get())
+            tolerance = float(entry_tolerance.get())
+            job = lambda progress: dormand_prince_method(x0, y0, xn, tolerance, expr, progress)
+            params = {'x0': x0, 'y0': y0, 'xn': xn, 'tolerance': tolerance}
+            show = show_dormand_prince
         else:
             messagebox.showerror("Error", "Invalid method selected.")
+            return
     except ValueError as e:
         messagebox.showerror("Input Error", f"Error: {e}")
+        return
+
+    def on_done(result):
+        stop_live_plot()
+        status_var.set(f"{method}: done")
+        show(result)
+
+    def on_error(e):
+        stop_live_plot()
+        status_var.set(f"{method}: failed")
+        messagebox.showerror("Input Error" if isinstance(e, ValueError) else "Error", f"Error: {e}")
+
+    status_var.set(f"{method}: running...")
+    if live_plot is not None:
+        live_plot.start()
+    runner.submit(cached_job(method, expr, params, job), on_done, on_error,
+                  on_progress=lambda fraction: status_var.set(f"{method}: {fraction:.0%}"))
+
+
+def cancel_method():
+    if runner.busy:
+        runner.cancel()
+        stop_live_plot()
+        status_var.set("Cancelled")
+
+
+def show_dormand_prince(result):
+    messagebox.showinfo("Result", f"Accepted steps: {result.accepted_steps}\n"
+                                  f"Rejected steps: {result.rejected_steps}\n"
+                                  f"Function evaluations: {result.evaluations}")
+    plot_graph(result.x, result.y, 'Dormand-Prince Method')
 
 
 def plot_graph(x, y, title):
-    plt.figure()
-    plt.plot(x, y, marker='o')
-    plt.title(title)
-    plt.xlabel('x')
-    plt.ylabel('y')
-    plt.grid(True)
-    plt.show()
-
-
-# Create the main window
-root = tk.Tk()
-root.title("Advanced Mathematical Solution System")
-
-# Method selection
-method_var = tk.StringVar(value='Bisection')
-tk.Label(root, text="Select Method:").pack()
-tk.Radiobutton(root, text="Bisection", variable=method_var, value='Bisection').pack()
-tk.Radiobutton(root, text="Newton-Raphson", variable=method_var, value='Newton-Raphson').pack()
-tk.Radiobutton(root, text="Euler", variable=method_var, value='Euler').pack()
-tk.Radiobutton(root, text="Runge-Kutta", variable=method_var, value='Runge-Kutta').pack()
-
-# Inputs for Bisection and Newton-Raphson methods
-tk.Label(root, text="Expression:").pack()
-entry_expr = tk.Entry(root)
-entry_expr.pack()
-
-tk.Label(root, text="Tolerance:").pack()
-entry_tolerance = tk.Entry(root)
-entry_tolerance.pack()
-
-tk.Label(root, text="Max Iterations:").pack()
-entry_max_iterations = tk.Entry(root)
-entry_max_iterations.pack()
-
-tk.Label(root, text="a (for Bisection):").pack()
-entry_a = tk.Entry(root)
-entry_a.pack()
-
-tk.Label(root, text="b (for Bisection):").pack()
-entry_b = tk.Entry(root)
-entry_b.pack()
-
-tk.Label(root, text="x0 (for Newton-Raphson and Euler and Runge-Kutta):").pack()
-entry_x0 = tk.Entry(root)
-entry_x0.pack()
-
-tk.Label(root, text="y0 (for Euler and Runge-Kutta):").pack()
-entry_y0 = tk.Entry(root)
-entry_y0.pack()
-
-tk.Label(root, text="h (Step Size for Euler and Runge-Kutta):").pack()
-entry_h = tk.Entry(root)
-entry_h.pack()
-
-tk.Label(root, text="xn (End x for Euler and Runge-Kutta):").pack()
-entry_xn = tk.Entry(root)
-entry_xn.pack()
-
-# Run button
-tk.Button(root, text="Run", command=run_method).pack()
-
-root.mainloop()
+    # Downsampled to the canvas width and drawn on the embedded axes.
+    plot_trajectory(x, y, title, ax=plot_ax, show=False)
+    canvas.draw_idle()
+
+
+if __name__ == '__main__':
+    # Create the main window
+    root = tk.Tk()
+    root.title("Advanced Mathematical Solution System")
+
+    # Method selection
+    method_var = tk.StringVar(value='Bisection')
+    tk.Label(root, text="Select Method:").pack()
+    tk.Radiobutton(root, text="Bisection", variable=method_var, value='Bisection').pack()
+    tk.Radiobutton(root, text="Newton-Raphson", variable=method_var, value='Newton-Raphson').pack()
+    tk.Radiobutton(root, text="All Roots in [a, b]", variable=method_var, value='All Roots').pack()
+    tk.Radiobutton(root, text="Euler", variable=method_var, value='Euler').pack()
+    tk.Radiobutton(root, text="Runge-Kutta", variable=method_var, value='Runge-Kutta').pack()
+    tk.Radiobutton(root, text="Dormand-Prince (adaptive)", variable=method_var, value='Dormand-Prince').pack()
+
+    # Inputs for Bisection and Newton-Raphson methods
+    tk.Label(root, text="Expression (for a system of ODEs: y2; -y1):").pack()
+    entry_expr = tk.Entry(root)
+    entry_expr.pack()
+
+    tk.Label(root, text="Parameters (e.g. a=2, b=0.5 for Bisection and Newton-Raphson):").pack()
+    entry_params = tk.Entry(root)
+    entry_params.pack()
+
+    tk.Label(root, text="Tolerance:").pack()
+    entry_tolerance = tk.Entry(root)
+    entry_tolerance.pack()
+
+    tk.Label(root, text="Max Iterations:").pack()
+    entry_max_iterations = tk.Entry(root)
+    entry_max_iterations.pack()
+
+    tk.Label(root, text="a (for Bisection and All Roots):").pack()
+    entry_a = tk.Entry(root)
+    entry_a.pack()
+
+    tk.Label(root, text="b (for Bisection and All Roots):").pack()
+    entry_b = tk.Entry(root)
+    entry_b.pack()
+
+    tk.Label(root, text="x0 (for Newton-Raphson, Euler, Runge-Kutta and Dormand-Prince):").pack()
+    entry_x0 = tk.Entry(root)
+    entry_x0.pack()
+
+    tk.Label(root, text="y0 (for Euler, Runge-Kutta and Dormand-Prince; one per equation, e.g. 1, 0):").pack()
+    entry_y0 = tk.Entry(root)
+    entry_y0.pack()
+
+    tk.Label(root, text="h (Step Size for Euler and Runge-Kutta):").pack()
+    entry_h = tk.Entry(root)
+    entry_h.pack()
+
+    tk.Label(root, text="xn (End x for Euler, Runge-Kutta and Dormand-Prince):").pack()
+    entry_xn = tk.Entry(root)
+    entry_xn.pack()
+
+    # Run and Cancel buttons; solvers run on a background worker
+    runner = BackgroundJobRunner(root)
+    tk.Button(root, text="Run", command=run_method).pack()
+    tk.Button(root, text="Cancel", command=cancel_method).pack()
+    status_var = tk.StringVar(value="Ready")
+    tk.Label(root, textvariable=status_var).pack()
+
+    # Results of repeated solves are reused when $NUMERICAL_METHODS_CACHE is set
+    result_cache = open_cache()
+    bypass_cache_var = tk.BooleanVar(value=False)
+    if result_cache.enabled:
+        tk.Checkbutton(root, text="Bypass result cache", variable=bypass_cache_var).pack()
+
+    # Embedded plot; ODE trajectories are drawn live while they are solved
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(6, 4))
+    plot_ax = figure.add_subplot()
+    canvas = FigureCanvasTkAgg(figure, master=root)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    root.mainloop()
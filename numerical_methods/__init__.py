@@ -0,0 +1,72 @@
+"""Numerical methods shared by the CLI and GUI front ends.
+
+Importing the package has no side effects: the public functions below are
+loaded from their submodules on first access, and NumPy / SymPy are only
+imported once a solver actually needs them.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'dormand_prince': 'adaptive_ode',
+    'AdaptiveResult': 'adaptive_ode',
+    'adaptive_simpson': 'adaptive_quadrature',
+    'gauss_kronrod': 'adaptive_quadrature',
+    'QuadratureResult': 'adaptive_quadrature',
+    'BackgroundJobRunner': 'background_jobs',
+    'JobCancelled': 'background_jobs',
+    'batch_bisection': 'batch_roots',
+    'batch_newton': 'batch_roots',
+    'run_batch': 'batch_runner',
+    'ensemble_euler': 'ensemble_ode',
+    'ensemble_runge_kutta_4': 'ensemble_ode',
+    'bind_parameters': 'expression_cache',
+    'compile_expression': 'expression_cache',
+    'cache_info': 'expression_cache',
+    'clear_cache': 'expression_cache',
+    'newton_system': 'newton_system',
+    'SystemResult': 'newton_system',
+    'compile_system': 'ode_systems',
+    'euler_system': 'ode_systems',
+    'parse_system': 'ode_systems',
+    'runge_kutta_4_system': 'ode_systems',
+    'polynomial_coefficients': 'polynomial',
+    'real_polynomial_roots': 'polynomial',
+    'high_precision_root': 'high_precision',
+    'refine_root': 'high_precision',
+    'RefinedRoot': 'high_precision',
+    'sweep_roots': 'parameter_sweep',
+    'SweepResult': 'parameter_sweep',
+    'DownsampledLine': 'plotting',
+    'LiveTrajectoryPlot': 'plotting',
+    'lttb_downsample': 'plotting',
+    'minmax_downsample': 'plotting',
+    'plot_trajectory': 'plotting',
+    'ResultCache': 'result_cache',
+    'open_cache': 'result_cache',
+    'RombergIntegrator': 'romberg',
+    'find_all_roots': 'root_scan',
+    'scalar_illinois': 'scalar_roots',
+    'scalar_newton': 'scalar_roots',
+    'ScalarResult': 'scalar_roots',
+    'backward_euler': 'stiff_ode',
+    'bdf2': 'stiff_ode',
+    'rosenbrock': 'stiff_ode',
+    'StiffResult': 'stiff_ode',
+    'simpsons_rule_streaming': 'streaming_quadrature',
+    'integrate_to_sink': 'trajectory_stream',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
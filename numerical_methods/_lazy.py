@@ -0,0 +1,23 @@
+"""Deferred imports of heavy dependencies.
+
+`np = lazy_import('numpy')` gives a stand-in module that imports NumPy
+the first time one of its attributes is used, so importing a solver module
+stays cheap until a solver actually runs.  After that first use the real
+module's namespace is copied over and attribute access is as fast as on
+the real module.
+"""
+
+import importlib
+import types
+
+
+class _LazyModule(types.ModuleType):
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """Module stand-in for `name` that is imported on first attribute access."""
+    return _LazyModule(name)
@@ -0,0 +1,107 @@
+"""Adaptive-step Dormand-Prince 5(4) integration of `dy/dx = f(x, y)`.
+
+The fifth-order solution is propagated and the embedded fourth-order one
+is only used for the local error estimate that drives the step size.  The
+last stage of an accepted step is the first stage of the next one (FSAL),
+so each step costs six new evaluations of `f`.
+"""
+
+from collections import namedtuple
+
+from numerical_methods._lazy import lazy_import
+
+np = lazy_import('numpy')
+
+AdaptiveResult = namedtuple('AdaptiveResult', ['x', 'y', 'accepted_steps', 'rejected_steps', 'evaluations'])
+
+# Butcher tableau.
+C = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1)
+A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+B5 = A[6] + (0,)
+B4 = (5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+E = tuple(b5 - b4 for b5, b4 in zip(B5, B4))
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+
+def _rms(v):
+    return np.sqrt(np.mean(np.square(v)))
+
+
+def _initial_step(x0, y0, f0, x_end, rtol, atol):
+    """Starting step from the size of y0 and f(x0, y0) (Hairer, Norsett & Wanner)."""
+    scale = atol + rtol * np.abs(y0)
+    d0 = _rms(y0 / scale)
+    d1 = _rms(f0 / scale)
+    h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    return min(h, x_end - x0)
+
+
+def dormand_prince(f, y0, x0, x_end, rtol=1e-6, atol=1e-9, h=None, max_steps=100000, progress=None):
+    """Integrate from `x0` to `x_end` with error control on every step.
+
+    `y0` may be a scalar or an array for systems.  Returns the accepted
+    grid points and solution together with accepted/rejected step counts
+    and the total number of right-hand-side evaluations.  `progress`, if
+    given, is called now and then with the fraction of the interval done.
+    """
+    if x_end <= x0:
+        raise ValueError("End of interval must be greater than start.")
+    # atol = 0 would give a zero error scale wherever y is zero.
+    if rtol <= 0 or atol <= 0:
+        raise ValueError("Tolerances must be positive.")
+
+    x = float(x0)
+    y = np.asarray(y0, dtype=float)
+    k = [None] * 7
+    k[0] = np.asarray(f(x, y), dtype=float)
+    evaluations = 1
+    h = _initial_step(x, y, k[0], x_end, rtol, atol) if h is None else min(float(h), x_end - x)
+
+    x_vals = [x]
+    y_vals = [y]
+    accepted = rejected = 0
+
+    while x < x_end:
+        if accepted + rejected >= max_steps:
+            raise ValueError("Maximum number of steps exceeded.")
+        if progress is not None and (accepted + rejected) % 1000 == 0:
+            progress((x - x0) / (x_end - x0))
+        if h < 16 * np.spacing(abs(x)):
+            raise ValueError("Step size became too small.")
+        h = min(h, x_end - x)
+
+        for s in range(1, 7):
+            dy = sum(a * ks for a, ks in zip(A[s], k[:s]) if a)
+            k[s] = np.asarray(f(x + C[s] * h, y + h * dy), dtype=float)
+        evaluations += 6
+
+        y_new = y + h * sum(b * ks for b, ks in zip(B5, k) if b)
+        error = h * sum(e * ks for e, ks in zip(E, k) if e)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err = _rms(error / scale)
+
+        if err <= 1:
+            accepted += 1
+            x = x + h if x + h < x_end else x_end
+            y = y_new
+            k[0] = k[6]
+            x_vals.append(x)
+            y_vals.append(y)
+            factor = MAX_FACTOR if err == 0 else min(MAX_FACTOR, SAFETY * err ** -0.2)
+        else:
+            rejected += 1
+            factor = max(MIN_FACTOR, SAFETY * err ** -0.2)
+        h *= factor
+
+    return AdaptiveResult(np.array(x_vals), np.array(y_vals), accepted, rejected, evaluations)
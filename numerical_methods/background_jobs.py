@@ -0,0 +1,109 @@
+"""Run solver jobs off the Tk main thread.
+
+A single worker thread takes jobs from a queue.  Jobs report progress
+through a callback that also checks for cancellation, so long solver loops
+stop cooperatively at their next progress report.  Results, errors and
+progress are handed back to the main thread by polling with `root.after`,
+and anything coming from a job that has been cancelled or superseded by a
+newer submission is discarded.
+"""
+
+import queue
+import threading
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once it has been cancelled or superseded."""
+
+
+class _Job:
+    def __init__(self, func, on_done, on_error, on_progress):
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancelled = threading.Event()
+
+
+class BackgroundJobRunner:
+    """Queue of background jobs whose callbacks run on the Tk main thread."""
+
+    def __init__(self, root, poll_interval=50):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._jobs = queue.Queue()
+        self._events = queue.Queue()
+        self._current = None
+        self._polling = False
+        threading.Thread(target=self._work, daemon=True).start()
+
+    @property
+    def busy(self):
+        return self._current is not None
+
+    def submit(self, func, on_done, on_error=None, on_progress=None):
+        """Run `func(progress)` in the background, superseding any running job.
+
+        `func` should call `progress(fraction)` now and then; that call raises
+        `JobCancelled` once the job is cancelled.  `on_done(result)`,
+        `on_error(exception)` and `on_progress(fraction)` run on the main
+        thread and only for the most recently submitted job.
+        """
+        self.cancel()
+        job = _Job(func, on_done, on_error, on_progress)
+        self._current = job
+        self._jobs.put(job)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def cancel(self):
+        """Ask the current job to stop; its outcome will be ignored."""
+        if self._current is not None:
+            self._current.cancelled.set()
+            self._current = None
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job.cancelled.is_set():
+                continue
+
+            def progress(fraction, job=job):
+                if job.cancelled.is_set():
+                    raise JobCancelled()
+                self._events.put((job, 'progress', fraction))
+
+            try:
+                self._events.put((job, 'done', job.func(progress)))
+            except JobCancelled:
+                pass
+            except Exception as e:
+                self._events.put((job, 'error', e))
+
+    def _poll(self):
+        latest_progress = None
+        while True:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if job is not self._current:
+                continue  # stale: cancelled or superseded
+            if kind == 'progress':
+                latest_progress = payload
+                continue
+            self._current = None
+            latest_progress = None
+            if kind == 'done':
+                job.on_done(payload)
+            elif job.on_error is not None:
+                job.on_error(payload)
+
+        if latest_progress is not None and self._current is not None and self._current.on_progress is not None:
+            self._current.on_progress(latest_progress)
+
+        if self._current is not None:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self._polling = False
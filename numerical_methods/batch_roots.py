@@ -0,0 +1,147 @@
+"""Vectorized root finders that solve many independent problems at once.
+
+Each solver evaluates the lambdified NumPy function once per iteration
+over every lane that is still running instead of looping over scalar
+problems in Python.
+"""
+
+from collections import namedtuple
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.expression_cache import compile_expression
+from numerical_methods.scalar_roots import CONVERGED, DIVERGED, MAX_ITERATIONS, ZERO_DERIVATIVE
+
+np = lazy_import('numpy')
+
+BisectionResult = namedtuple('BisectionResult', ['roots', 'iterations', 'converged'])
+NewtonResult = namedtuple('NewtonResult', ['roots', 'iterations', 'status'])
+
+
+def _broadcast_problem(arrays, params):
+    """Broadcast the per-lane inputs and parameter arrays to one flat lane axis."""
+    params = params or {}
+    arrays = [np.asarray(v, dtype=float) for v in arrays]
+    values = {name: np.asarray(v, dtype=float) for name, v in params.items()}
+    try:
+        shape = np.broadcast_shapes(*[v.shape for v in arrays], *[v.shape for v in values.values()])
+    except ValueError:
+        raise ValueError("Inputs and parameter arrays must broadcast to a common shape.")
+    flat = [np.broadcast_to(v, shape).ravel().copy() for v in arrays]
+    values = {name: np.broadcast_to(v, shape).ravel() for name, v in values.items()}
+    return shape, flat, values
+
+
+def _lane_evaluator(func, values):
+    """Wrap a callable over (x, *params) so it can be evaluated on a subset of lanes.
+
+    Callables returning a list (fused function and derivatives) give a tuple
+    of lane arrays.
+    """
+    columns = list(values.values())
+
+    def evaluate(x, lanes):
+        result = func(x, *[v[lanes] for v in columns])
+        # Constant expressions come back as scalars, so broadcast to the lane shape.
+        if isinstance(result, list):
+            return tuple(np.broadcast_to(np.asarray(r, dtype=float), x.shape) for r in result)
+        return np.broadcast_to(np.asarray(result, dtype=float), x.shape)
+
+    return evaluate
+
+
+def batch_bisection(a, b, tolerance, max_iterations, expr, params=None, f_tolerance=None):
+    """Bisection method over arrays of brackets `[a, b]`.
+
+    A lane stops when `|f(c)| < f_tolerance` (default `tolerance`) or its
+    bracket is narrower than `2 * tolerance`; pass `f_tolerance=0` to
+    locate roots to `tolerance` in x even where `f` is flat.
+    `params` optionally maps extra symbol names in `expr` to arrays that
+    broadcast against the brackets, so one call can also sweep parameters.
+    Lanes whose bracket has no sign change are reported as not converged
+    with a NaN root rather than raising.
+    """
+    shape, (a, b), values = _broadcast_problem((a, b), params)
+    tolerance = float(tolerance)
+    f_tolerance = tolerance if f_tolerance is None else float(f_tolerance)
+    max_iterations = int(max_iterations)
+
+    f = _lane_evaluator(compile_expression(expr, ('x',) + tuple(values)).func, values)
+    lanes = np.arange(a.size)
+    fa = f(a, lanes).copy()
+    fb = f(b, lanes)
+
+    roots = np.full(a.size, np.nan)
+    iterations = np.zeros(a.size, dtype=int)
+    converged = np.zeros(a.size, dtype=bool)
+
+    # Endpoints that are already exact roots need no iterations.
+    at_a = fa == 0
+    at_b = (fb == 0) & ~at_a
+    roots[at_a] = a[at_a]
+    roots[at_b] = b[at_b]
+    converged[at_a | at_b] = True
+
+    active = np.flatnonzero(fa * fb < 0)
+    for iteration in range(1, max_iterations + 1):
+        if active.size == 0:
+            break
+        lo = a[active]
+        hi = b[active]
+        c = (lo + hi) / 2
+        fc = f(c, active)
+
+        roots[active] = c
+        iterations[active] = iteration
+        done = (np.abs(fc) < f_tolerance) | (fc == 0) | ((hi - lo) / 2 < tolerance)
+        converged[active[done]] = True
+
+        left = fa[active] * fc < 0
+        b[active[left]] = c[left]
+        a[active[~left]] = c[~left]
+        fa[active[~left]] = fc[~left]
+
+        active = active[~done]
+
+    return BisectionResult(roots.reshape(shape), iterations.reshape(shape), converged.reshape(shape))
+
+
+def batch_newton(x0, tolerance, max_iterations, expr, params=None):
+    """Newton-Raphson method started from every point in the array `x0`.
+
+    Lanes never raise: each one ends with a status of `CONVERGED`,
+    `MAX_ITERATIONS`, `ZERO_DERIVATIVE` or `DIVERGED` (a non-finite step)
+    and is dropped from the working set as soon as it stops.
+    """
+    shape, (roots,), values = _broadcast_problem((x0,), params)
+    tolerance = float(tolerance)
+    max_iterations = int(max_iterations)
+
+    compiled = compile_expression(expr, ('x',) + tuple(values))
+    f_and_prime = _lane_evaluator(compiled.fused(var='x'), values)
+
+    iterations = np.zeros(roots.size, dtype=int)
+    status = np.full(roots.size, MAX_ITERATIONS)
+
+    active = np.arange(roots.size)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for iteration in range(1, max_iterations + 1):
+            if active.size == 0:
+                break
+            x = roots[active]
+            f_x, f_prime_x = f_and_prime(x, active)
+
+            zero = f_prime_x == 0
+            x_new = x - f_x / f_prime_x
+            bad = ~zero & ~np.isfinite(x_new)
+            status[active[zero]] = ZERO_DERIVATIVE
+            status[active[bad]] = DIVERGED
+
+            ok = ~(zero | bad)
+            roots[active[ok]] = x_new[ok]
+            iterations[active[ok]] = iteration
+            done = ok & (np.abs(x_new - x) < tolerance)
+            status[active[done]] = CONVERGED
+
+            active = active[ok & ~done]
+
+    return NewtonResult(roots.reshape(shape), iterations.reshape(shape), status.reshape(shape))
@@ -0,0 +1,338 @@
+"""Headless batch runner for solver jobs.
+
+Reads jobs from a JSONL or CSV file, solves them on a process pool and
+streams one JSON result line per job to the output file.  Each job names
+a method, an expression and the method's parameters, e.g.
+
+    {"id": 1, "method": "bisection", "expr": "x**3 - x - 2", "a": 1, "b": 2}
+
+Systems take a list of expressions, e.g. `"expr": ["x1**2 + x2**2 - 4",
+"exp(x1) + x2 - 1"], "x0": [1, -1]` with the `newton_system` method.  A
+`sweep` job solves one expression along the values of a parameter, e.g.
+`"expr": "x**3 - a*x - 2", "parameter": "a", "values": [0, 0.1, 0.2], "x0": 1.5`.
+
+or, in CSV, the columns `id,method,expr,a,b,...`.  Jobs are submitted in
+chunks and each worker process keeps its own expression cache, so repeated
+expressions are only compiled once per worker.  Within a chunk, bisection
+and Newton jobs that share an expression and settings are solved together
+in one vectorized call.
+
+Usage:
+    python -m numerical_methods.batch_runner jobs.jsonl results.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.adaptive_ode import dormand_prince
+from numerical_methods.adaptive_quadrature import adaptive_simpson, gauss_kronrod
+from numerical_methods.batch_roots import CONVERGED, batch_bisection, batch_newton
+from numerical_methods.expression_cache import compile_expression
+from numerical_methods.high_precision import high_precision_root, mpmath_string
+from numerical_methods.newton_system import newton_system
+from numerical_methods.parameter_sweep import sweep_roots
+from numerical_methods.romberg import romberg
+from numerical_methods.root_scan import find_all_roots
+from numerical_methods.stiff_ode import backward_euler, bdf2, rosenbrock
+from numerical_methods.streaming_quadrature import simpsons_rule_streaming
+from numerical_methods.trajectory_stream import iter_trajectory
+
+np = lazy_import('numpy')
+
+RESERVED_FIELDS = ('id', 'method', 'expr', 'params')
+# Methods whose jobs are solved together in one vectorized call when they
+# share an expression and settings, and the fields that vary per job.
+LANE_FIELDS = {'bisection': ('a', 'b'), 'newton': ('x0',)}
+
+
+def _bisection(expr, a, b, tolerance=1e-6, max_iterations=100):
+    result = batch_bisection(a, b, tolerance, max_iterations, expr)
+    return [{'root': root, 'iterations': iterations} if converged else
+            ValueError("Bisection did not converge (no sign change or too few iterations).")
+            for root, iterations, converged in zip(*(np.atleast_1d(r).tolist() for r in result))]
+
+
+def _newton(expr, x0, tolerance=1e-6, max_iterations=100):
+    result = batch_newton(x0, tolerance, max_iterations, expr)
+    return [{'root': root, 'iterations': iterations} if status == CONVERGED else
+            ValueError(f"Newton-Raphson did not converge (status {status}).")
+            for root, iterations, status in zip(*(np.atleast_1d(r).tolist() for r in result))]
+
+
+def _high_precision_root(expr, x0, digits=50, tolerance=1e-12, max_iterations=100):
+    result = high_precision_root(expr, x0, int(digits), None, tolerance, int(max_iterations))
+    # JSON numbers are doubles, so the digits are returned as a string.
+    return {'root': mpmath_string(result.root, int(digits)), 'iterations': result.iterations,
+            'precisions': result.precisions, 'error': float(result.error)}
+
+
+def _newton_system(expr, x0, variables=None, tol=1e-10, max_iterations=50, update='broyden'):
+    result = newton_system(expr, x0, variables, tol, int(max_iterations), update)
+    return {'x': result.x, 'iterations': result.iterations, 'residual_norm': result.residual_norms[-1],
+            'jacobian_evaluations': result.jacobian_evaluations}
+
+
+def _sweep(expr, parameter, values, x0=None, bracket=None, tolerance=1e-10, max_iterations=50,
+           solver='newton', constants=None):
+    # `method` and `params` are taken by the job format, so the sweep's
+    # method is `solver` and its fixed symbols are `constants`.
+    return sweep_roots(expr, parameter, values, x0, bracket, tolerance, max_iterations, solver, constants)._asdict()
+
+
+def _all_roots(expr, a, b, tolerance=1e-10, samples=1000):
+    return {'roots': find_all_roots(expr, a, b, tolerance, samples=int(samples))}
+
+
+def _simpson(expr, a, b, n):
+    return {'integral': simpsons_rule_streaming(compile_expression(expr).func, a, b, int(n))}
+
+
+def _adaptive_simpson(expr, a, b, tol=1e-8):
+    return adaptive_simpson(compile_expression(expr).func, a, b, tol)._asdict()
+
+
+def _gauss_kronrod(expr, a, b, tol=1e-8):
+    return gauss_kronrod(compile_expression(expr).func, a, b, tol)._asdict()
+
+
+def _romberg(expr, a, b, tol=1e-8):
+    return {'integral': romberg(compile_expression(expr).func, a, b, tol)}
+
+
+def _fixed_step(method):
+    def solve(expr, y0, x0, x_end, h):
+        f = compile_expression(expr, ('x', 'y')).func
+        x = y = None
+        for x, y in iter_trajectory(method, f, y0, x0, x_end, h):
+            pass
+        return {'x': x, 'y': y}
+    return solve
+
+
+def _dormand_prince(expr, y0, x0, x_end, rtol=1e-6, atol=1e-9):
+    result = dormand_prince(compile_expression(expr, ('x', 'y')).func, y0, x0, x_end, rtol, atol)
+    return {'x': result.x[-1], 'y': result.y[-1], 'accepted_steps': result.accepted_steps,
+            'rejected_steps': result.rejected_steps, 'evaluations': result.evaluations}
+
+
+def _stiff(method):
+    def solve(expr, y0, x0, x_end, h):
+        result = method(expr, y0, x0, x_end, h)
+        return {'x': result.x[-1], 'y': result.y[-1], 'newton_iterations': result.newton_iterations,
+                'jacobian_evaluations': result.jacobian_evaluations}
+    return solve
+
+
+METHODS = {
+    'bisection': _bisection,
+    'newton': _newton,
+    'high_precision_root': _high_precision_root,
+    'newton_system': _newton_system,
+    'sweep': _sweep,
+    'all_roots': _all_roots,
+    'simpson': _simpson,
+    'adaptive_simpson': _adaptive_simpson,
+    'gauss_kronrod': _gauss_kronrod,
+    'romberg': _romberg,
+    'euler': _fixed_step('euler'),
+    'runge_kutta_4': _fixed_step('runge_kutta_4'),
+    'dormand_prince': _dormand_prince,
+    'backward_euler': _stiff(backward_euler),
+    'bdf2': _stiff(bdf2),
+    'rosenbrock': _stiff(rosenbrock),
+}
+
+
+def _to_json(value):
+    if isinstance(value, np.ndarray) and value.ndim == 0:
+        return value.item()
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _parse_number(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def read_jobs(path):
+    """Yield job dicts from a `.csv` file or a JSON-lines file."""
+    with open(path, newline='') as f:
+        if path.lower().endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield {k: _parse_number(v) if k not in ('method', 'expr') else v
+                       for k, v in row.items() if v not in ('', None)}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _job_params(job):
+    params = dict(job.get('params') or {})
+    params.update({k: v for k, v in job.items() if k not in RESERVED_FIELDS})
+    return params
+
+
+def _record(job, outcome):
+    """Result record for one job; a result that cannot be serialized becomes an error."""
+    record = {'id': job.get('id'), 'method': job.get('method')}
+    if not isinstance(outcome, Exception):
+        try:
+            record['result'] = _to_json(outcome)
+            json.dumps(record)
+            return record
+        except Exception as e:
+            del record['result']
+            outcome = e
+    record['error'] = f"{type(outcome).__name__}: {outcome}"
+    return record
+
+
+def run_job(job):
+    """Solve one job; returns the result record (with `error` on failure)."""
+    try:
+        if job.get('method') not in METHODS:
+            raise ValueError(f"Unknown method {job.get('method')!r}.")
+        if 'expr' not in job:
+            raise ValueError("Job has no expression.")
+        params = _job_params(job)
+        for field in LANE_FIELDS.get(job['method'], ()):
+            if field in params and not isinstance(params[field], (int, float)):
+                raise ValueError(f"{field!r} must be a single number, not {params[field]!r}; "
+                                 f"submit one job per value.")
+        outcome = METHODS[job['method']](job['expr'], **params)
+        if job['method'] in LANE_FIELDS:
+            outcome = outcome[0]
+    except Exception as e:
+        outcome = e
+    return _record(job, outcome)
+
+
+def _group_key(job):
+    """Key shared by jobs that can be solved in one vectorized call, or None."""
+    lanes = LANE_FIELDS.get(job.get('method'))
+    if lanes is None or 'expr' not in job:
+        return None
+    params = _job_params(job)
+    if not all(isinstance(params.get(field), (int, float)) for field in lanes):
+        return None
+    settings = tuple(sorted((k, v) for k, v in params.items() if k not in lanes))
+    try:
+        hash(settings)
+    except TypeError:
+        return None
+    return job['method'], job['expr'], settings
+
+
+def _run_chunk(chunk):
+    records = [None] * len(chunk)
+    groups = defaultdict(list)
+    for i, job in enumerate(chunk):
+        key = _group_key(job)
+        if key is None:
+            records[i] = run_job(job)
+        else:
+            groups[key].append(i)
+
+    for (method, expr, settings), members in groups.items():
+        lanes = {field: [_job_params(chunk[i])[field] for i in members] for field in LANE_FIELDS[method]}
+        try:
+            outcomes = METHODS[method](expr, **lanes, **dict(settings))
+        except Exception as e:
+            outcomes = [e] * len(members)
+        for i, outcome in zip(members, outcomes):
+            records[i] = _record(chunk[i], outcome)
+    return records
+
+
+def _chunks(jobs, chunk_size):
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(input_path, output_path, workers=None, chunk_size=256, ordered=True):
+    """Solve every job in `input_path`, writing JSON-lines results to `output_path`.
+
+    With `ordered=True` results are written in input order; otherwise each
+    chunk is written as soon as it completes.  At most a few chunks per
+    worker are in flight, so memory does not grow with the number of jobs.
+    Returns `(jobs, errors)` counts.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    chunks = enumerate(_chunks(read_jobs(input_path), chunk_size))
+    pending = {}
+    finished = {}
+    next_to_write = 0
+    jobs = errors = 0
+
+    with ProcessPoolExecutor(workers) as pool, open(output_path, 'w') as out:
+        def write(records):
+            nonlocal jobs, errors
+            for record in records:
+                out.write(json.dumps(record) + '\n')
+                jobs += 1
+                errors += 'error' in record
+
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) + len(finished) < max_in_flight:
+                try:
+                    number, chunk = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[pool.submit(_run_chunk, chunk)] = number
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                number = pending.pop(future)
+                if ordered:
+                    finished[number] = future.result()
+                else:
+                    write(future.result())
+            while next_to_write in finished:
+                write(finished.pop(next_to_write))
+                next_to_write += 1
+
+    return jobs, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of jobs without the interactive prompts.")
+    parser.add_argument('input', help="jobs as JSON lines or .csv")
+    parser.add_argument('output', help="results file (JSON lines)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="jobs per submitted task")
+    parser.add_argument('--as-completed', action='store_true', help="write results as chunks finish")
+    args = parser.parse_args(argv)
+
+    jobs, errors = run_batch(args.input, args.output, args.workers, args.chunk_size, not args.as_completed)
+    print(f"Solved {jobs} jobs ({errors} errors).")
+
+
+if __name__ == '__main__':
+    main()
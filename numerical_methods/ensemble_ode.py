@@ -0,0 +1,108 @@
+"""Euler and RK4 integration of one ODE for a whole ensemble of initial values.
+
+The right-hand side `dy/dx = expr` is lambdified once and every step
+evaluates it for all ensemble members together.  Trajectories are laid
+out as a `(steps, members)` array; large ensembles can be integrated in
+member chunks so the working set stays bounded.
+"""
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.expression_cache import compile_expression
+
+np = lazy_import('numpy')
+
+
+def _euler_step(f, x, y, h, params):
+    return y + h * f(x, y, *params)
+
+
+def _runge_kutta_4_step(f, x, y, h, params):
+    k1 = h * f(x, y, *params)
+    k2 = h * f(x + h / 2, y + k1 / 2, *params)
+    k3 = h * f(x + h / 2, y + k2 / 2, *params)
+    k4 = h * f(x + h, y + k3, *params)
+    return y + (k1 + 2 * k2 + 2 * k3 + k4) / 6
+
+
+STEPPERS = {
+    'euler': _euler_step,
+    'runge_kutta_4': _runge_kutta_4_step,
+}
+
+
+def _broadcast_members(y0, params):
+    """Broadcast `y0` and the parameter arrays to one ensemble axis."""
+    y0 = np.atleast_1d(np.asarray(y0, dtype=float))
+    values = [np.asarray(v, dtype=float) for v in params.values()]
+    try:
+        members = np.broadcast_shapes(y0.shape, *[v.shape for v in values])
+    except ValueError:
+        raise ValueError("Initial values and parameter arrays must broadcast to a common shape.")
+    if len(members) != 1:
+        raise ValueError("Ensembles must be one-dimensional.")
+    return np.broadcast_to(y0, members), [np.broadcast_to(v, members) for v in values]
+
+
+def _ensemble_setup(expr, y0, x0, x_end, h, params):
+    if h <= 0:
+        raise ValueError("Step size must be positive.")
+    y0, values = _broadcast_members(y0, params)
+    names = tuple(params)
+
+    func = compile_expression(expr, ('x', 'y') + names).func
+
+    def f(x, y, *p):
+        # Constant right-hand sides come back as scalars.
+        return np.broadcast_to(func(x, y, *p), y.shape)
+
+    x = np.arange(x0, x_end, h)
+    return f, x, y0, values
+
+
+def iter_ensemble_chunks(method, expr, y0, x0, x_end, h, params=None, chunk_size=None):
+    """Integrate the ensemble in member chunks.
+
+    Yields `(start, stop, y)` where `y` holds the `(steps, stop - start)`
+    trajectories of members `start:stop`.  Only one chunk is held in memory
+    at a time.
+    """
+    step = STEPPERS[method]
+    f, x, y0, values = _ensemble_setup(expr, y0, x0, x_end, h, params or {})
+    members = y0.size
+    chunk_size = members if chunk_size is None else int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive.")
+
+    for start in range(0, members, chunk_size):
+        stop = min(start + chunk_size, members)
+        p = [v[start:stop] for v in values]
+        y = np.zeros((len(x), stop - start))
+        if len(x):
+            y[0] = y0[start:stop]
+        for i in range(1, len(x)):
+            y[i] = step(f, x[i - 1], y[i - 1], h, p)
+        yield start, stop, y
+
+
+def _ensemble(method, expr, y0, x0, x_end, h, params, chunk_size, out):
+    x = np.arange(x0, x_end, h)
+    if out is None:
+        out = np.zeros((len(x), _broadcast_members(y0, params or {})[0].size))
+    for start, stop, y in iter_ensemble_chunks(method, expr, y0, x0, x_end, h, params, chunk_size):
+        out[:, start:stop] = y
+    return x, out
+
+
+def ensemble_euler(expr, y0, x0, x_end, h, params=None, chunk_size=None, out=None):
+    """Euler method for `dy/dx = expr` over an array of initial values `y0`.
+
+    `params` maps extra symbols in `expr` to per-member arrays.  Pass
+    `chunk_size` to bound the working set and `out` (for example an
+    `np.memmap`) to keep the full trajectory off the heap.
+    """
+    return _ensemble('euler', expr, y0, x0, x_end, h, params, chunk_size, out)
+
+
+def ensemble_runge_kutta_4(expr, y0, x0, x_end, h, params=None, chunk_size=None, out=None):
+    """Fourth-order Runge-Kutta counterpart of `ensemble_euler`."""
+    return _ensemble('runge_kutta_4', expr, y0, x0, x_end, h, params, chunk_size, out)
@@ -0,0 +1,243 @@
+"""Bounded LRU cache of parsed and lambdified expressions.
+
+Every solver front end turns an expression string into a SymPy expression
+and a NumPy callable.  Both steps are slow compared to evaluating the
+callable, so the results are kept here keyed on the canonical expression
+and the tuple of variables it is compiled over.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.polynomial import compile_horner, horner_coefficients
+
+sp = lazy_import('sympy')
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+def _normalize_variables(variables):
+    """Return `variables` as a tuple of SymPy symbols.
+
+    Nested sequences are kept nested; lambdify then unpacks that argument
+    from a single array, e.g. `('x', ('y1', 'y2'))` gives `f(x, y)`.
+    """
+    if isinstance(variables, (str, sp.Symbol)):
+        variables = (variables,)
+    return tuple(sp.Symbol(v) if isinstance(v, str) else
+                 v if isinstance(v, sp.Symbol) else _normalize_variables(v)
+                 for v in variables)
+
+
+def _alias_key(expr):
+    """Hashable form of raw expression text, or None if `expr` is not text."""
+    if isinstance(expr, str):
+        return expr
+    if isinstance(expr, (list, tuple)) and all(isinstance(e, str) for e in expr):
+        return tuple(expr)
+    return None
+
+
+class CompiledExpression:
+    """A parsed expression, its numeric callable and lazily built derivatives.
+
+    Expanded polynomials of moderate degree in a single variable are
+    compiled to Horner form instead of going through lambdify;
+    `coefficients` is None for anything else, including factored forms.
+    """
+
+    def __init__(self, expr, variables, modules='numpy'):
+        self.expr = expr
+        self.variables = variables
+        self.modules = modules
+        self.coefficients = None
+        if modules == 'numpy' and len(variables) == 1 and isinstance(variables[0], sp.Symbol):
+            self.coefficients = horner_coefficients(expr, variables[0])
+        if self.coefficients is not None:
+            self.func = compile_horner(self.coefficients)
+        else:
+            self.func = sp.lambdify(variables, expr, modules)
+        self._derivatives = {}
+        self._fused = {}
+        self._jacobians = {}
+        self._sparse_jacobians = {}
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+    def derivative_expr(self, order=1, var=None):
+        """Symbolic derivative of the expression of the given order."""
+        return self._derivative(order, var)[0]
+
+    def derivative(self, order=1, var=None):
+        """Numeric callable for the derivative of the given order."""
+        return self._derivative(order, var)[1]
+
+    def fused(self, order=1, var=None):
+        """One callable returning `[f, f', ..., f^(order)]`.
+
+        The function and its derivatives are lambdified together with common
+        subexpression elimination, so shared terms such as `exp(x)` or
+        `sin(x)` are computed once per call.
+        """
+        var = self.variables[0] if var is None else _normalize_variables(var)[0]
+        key = (var, order)
+        if key not in self._fused and order == 1 and self.coefficients is not None:
+            self._fused[key] = compile_horner(self.coefficients, derivative=True)
+        if key not in self._fused:
+            exprs = [self.expr] + [sp.diff(self.expr, var, k) for k in range(1, order + 1)]
+            self._fused[key] = sp.lambdify(self.variables, exprs, self.modules, cse=True)
+        return self._fused[key]
+
+    def jacobian_expr(self, var=None):
+        """Symbolic Jacobian of the expression (or list of them) with respect to `var`.
+
+        `var` is one variable or a sequence of them, e.g. `('y1', 'y2')`; by
+        default the first argument the expression is compiled over.
+        """
+        return self._jacobian(var)[0]
+
+    def jacobian(self, var=None):
+        """Numeric callable returning the Jacobian as an `(equations, len(var))` array."""
+        return self._jacobian(var)[1]
+
+    def _jacobian(self, var):
+        wrt = _normalize_variables(self.variables[0] if var is None else var)
+        if wrt not in self._jacobians:
+            exprs = self.expr if isinstance(self.expr, (list, tuple)) else [self.expr]
+            matrix = sp.Matrix(exprs).jacobian(list(wrt))
+            self._jacobians[wrt] = (matrix, sp.lambdify(self.variables, matrix, self.modules, cse=True))
+        return self._jacobians[wrt]
+
+    def sparse_jacobian(self, var=None):
+        """Structurally nonzero Jacobian entries as `(rows, cols, values)`.
+
+        `var` must be a flat sequence of variables.  Each expression is only
+        differentiated with respect to the variables it contains, and
+        `values` is a callable returning the entries at `(rows, cols)` as one
+        list, so entries that are identically zero are never built or
+        evaluated.
+        """
+        wrt = _normalize_variables(self.variables[0] if var is None else var)
+        if wrt not in self._sparse_jacobians:
+            index = {v: j for j, v in enumerate(wrt)}
+            exprs = self.expr if isinstance(self.expr, (list, tuple)) else [self.expr]
+            rows, cols, entries = [], [], []
+            for i, expr in enumerate(exprs):
+                for v in sorted(expr.free_symbols & index.keys(), key=index.get):
+                    d_expr = sp.diff(expr, v)
+                    if d_expr != 0:
+                        rows.append(i)
+                        cols.append(index[v])
+                        entries.append(d_expr)
+            values = sp.lambdify(self.variables, entries, self.modules, cse=True)
+            self._sparse_jacobians[wrt] = (rows, cols, values)
+        return self._sparse_jacobians[wrt]
+
+    def _derivative(self, order, var):
+        var = self.variables[0] if var is None else _normalize_variables(var)[0]
+        key = (var, order)
+        if key not in self._derivatives:
+            d_expr = sp.diff(self.expr, var, order)
+            self._derivatives[key] = (d_expr, sp.lambdify(self.variables, d_expr, self.modules))
+        return self._derivatives[key]
+
+
+class ExpressionCache:
+    """Thread-safe LRU mapping of (expression, variables) to `CompiledExpression`."""
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        # Raw input text -> canonical key, so repeated strings skip sympify.
+        self._aliases = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, expr, variables=('x',), modules='numpy'):
+        """Return the compiled form of `expr`, building it on a miss."""
+        variables = _normalize_variables(variables)
+        text = _alias_key(expr)
+        alias = (text, variables, modules) if text is not None else None
+
+        with self._lock:
+            key = self._aliases.get(alias) if alias is not None else None
+            if key is not None and key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        parsed = sp.sympify(expr)
+        key = (sp.srepr(parsed), variables, modules)
+
+        with self._lock:
+            if alias is not None:
+                self._aliases[alias] = key
+                if len(self._aliases) > 4 * self.maxsize:
+                    self._aliases.popitem(last=False)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        compiled = CompiledExpression(parsed, variables, modules)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                for stale in [a for a, k in self._aliases.items() if k == evicted]:
+                    del self._aliases[stale]
+                self.evictions += 1
+        return compiled
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_default_cache = ExpressionCache()
+
+
+def compile_expression(expr, variables=('x',), modules='numpy'):
+    """Parse and lambdify `expr` over `variables`, reusing earlier results.
+
+    `expr` may also be a list of expressions, compiled into one callable
+    that returns all of them.
+    """
+    return _default_cache.get(expr, variables, modules)
+
+
+def bind_parameters(func, params=None):
+    """Fix trailing parameter arguments of `func` to the values in `params`.
+
+    `func` is compiled over its variables followed by the names in
+    `params` (in order), e.g. `compile_expression(expr, ('x',) + tuple(params))`;
+    the result takes only the variables.
+    """
+    if not params:
+        return func
+    values = tuple(float(v) for v in params.values())
+    return lambda *args: func(*args, *values)
+
+
+def cache_info():
+    """Hit/miss/eviction counters of the shared expression cache."""
+    return _default_cache.cache_info()
+
+
+def clear_cache():
+    _default_cache.clear()
@@ -0,0 +1,101 @@
+"""Roots to 50-1000 digits by Newton refinement with precision doubling.
+
+A root is first found in double precision with `batch_newton`.  Newton's
+method then doubles the number of correct digits per iteration, so the
+refinement runs at a working precision that doubles along with them:
+each iteration only carries about twice the digits its input already has,
+and the total cost is dominated by the final iteration at full precision
+instead of every iteration paying for it.
+
+The expression and its derivative are lambdified once for mpmath through
+the expression cache.  Decimal literals such as `0.1` are parsed as
+doubles, so write exact constants as fractions (`1/10`) when the digits
+beyond the 16th matter.
+"""
+
+import math
+from collections import namedtuple
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.batch_roots import CONVERGED, batch_newton
+from numerical_methods.expression_cache import compile_expression
+
+mpmath = lazy_import('mpmath')
+
+RefinedRoot = namedtuple('RefinedRoot', ['root', 'iterations', 'precisions', 'error'])
+
+DOUBLE_PRECISION_BITS = 53
+# Extra bits carried at every precision to absorb rounding in f and f'.
+GUARD_BITS = 20
+
+
+def mpmath_string(value, digits):
+    """`value` printed with `digits` significant digits."""
+    return mpmath.nstr(value, digits, strip_zeros=False)
+
+
+def precision_schedule(bits, start=DOUBLE_PRECISION_BITS):
+    """Working precisions in bits, roughly doubling from `start` up to `bits`.
+
+    Built backwards by halving the target, so the last entry is exactly
+    `bits` and every entry is at most about twice the one before it.
+    """
+    schedule = [bits]
+    while schedule[-1] > 2 * start:
+        schedule.append(schedule[-1] // 2 + GUARD_BITS)
+    return schedule[::-1]
+
+
+def refine_root(expr, x0, digits=50, params=None, max_iterations=10):
+    """Refine the double-precision root `x0` of `expr` to `digits` significant digits.
+
+    Newton steps run at the precisions of `precision_schedule`, followed by
+    up to `max_iterations` more at full precision if needed.  After a step
+    `s` the error of the new iterate is estimated from the quadratic model
+    as `|f'' / (2 f')| * s**2`, so no extra step is spent only to confirm
+    convergence.  `params` fixes extra symbols in `expr` (strings keep all
+    their digits).
+
+    Returns a `RefinedRoot` with the root as an `mpmath.mpf`, the number of
+    Newton steps, the precisions they ran at and the error estimate.
+    """
+    digits = int(digits)
+    if digits < 1:
+        raise ValueError("Number of digits must be positive.")
+    params = params or {}
+    compiled = compile_expression(expr, ('x',) + tuple(params), modules='mpmath')
+    derivatives = compiled.fused(order=2, var='x')
+    bits = int(math.ceil(digits * math.log2(10))) + GUARD_BITS
+    schedule = precision_schedule(bits)
+
+    x = mpmath.mpf(float(x0))
+    precisions = []
+    for prec in schedule + [bits] * max_iterations:
+        with mpmath.workprec(prec):
+            values = [mpmath.mpmathify(v) for v in params.values()]
+            f_x, f_prime_x, f_second_x = derivatives(+x, *values)
+            if f_prime_x == 0:
+                raise ValueError("Derivative is zero. Newton refinement fails.")
+            step = f_x / f_prime_x
+            x = x - step
+            error = abs(f_second_x / (2 * f_prime_x)) * step ** 2
+        precisions.append(prec)
+        if len(precisions) >= len(schedule) and error <= mpmath.mpf(10) ** -digits * (abs(x) or 1):
+            return RefinedRoot(x, len(precisions), precisions, error)
+    raise ValueError(f"Newton refinement did not reach {digits} digits "
+                     f"(estimated error {mpmath.nstr(error, 3)}).")
+
+
+def high_precision_root(expr, x0, digits=50, params=None, tolerance=1e-12, max_iterations=100):
+    """Find a root near the guess `x0` in double precision, then refine it to `digits` digits.
+
+    See `refine_root`; the double-precision stage is `batch_newton` with
+    `tolerance` and `max_iterations`.
+    """
+    # The double-precision stage gets the parameters rounded to floats;
+    # only the refinement sees strings with all their digits.
+    doubles = {name: float(mpmath.mpmathify(v)) for name, v in (params or {}).items()}
+    start = batch_newton(float(x0), tolerance, max_iterations, expr, doubles)
+    if int(start.status) != CONVERGED:
+        raise ValueError("Newton-Raphson did not converge in double precision; try another initial guess.")
+    return refine_root(expr, float(start.roots), digits, params)
@@ -0,0 +1,150 @@
+"""Newton's method for nonlinear systems `F(x1, ..., xn) = 0`.
+
+The Jacobian is derived symbolically once and compiled through the
+expression cache; only its structurally nonzero entries are evaluated.
+Large systems whose Jacobian is mostly zero are factored as a sparse
+matrix.  A factorization is reused for as long as the residual keeps
+shrinking fast enough:
+
+* `update='newton'` refactors the Jacobian at every iteration.
+* `update='chord'` keeps the last factorization until a step fails to cut
+  the residual norm by `reuse_ratio`.
+* `update='broyden'` (default) does the same but applies Broyden's rank-one
+  updates on top of the factorization, which keeps superlinear convergence
+  between Jacobian evaluations.
+"""
+
+import warnings
+from collections import namedtuple
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.expression_cache import compile_expression
+
+np = lazy_import('numpy')
+scipy_linalg = lazy_import('scipy.linalg')
+scipy_sparse = lazy_import('scipy.sparse')
+scipy_sparse_linalg = lazy_import('scipy.sparse.linalg')
+
+SystemResult = namedtuple('SystemResult', ['x', 'iterations', 'residual_norms', 'jacobian_evaluations'])
+
+UPDATES = ('newton', 'chord', 'broyden')
+# With sparse='auto', systems of at least this many unknowns whose Jacobian
+# has at most this fraction of structurally nonzero entries use sparse LU.
+SPARSE_MIN_SIZE = 50
+SPARSE_MAX_DENSITY = 0.1
+
+
+def system_unknowns(n):
+    """Default unknowns of a system of `n` equations: x1, ..., xn."""
+    return tuple(f'x{i}' for i in range(1, n + 1))
+
+
+class _System:
+    """Compiled residual and Jacobian of a square system."""
+
+    def __init__(self, exprs, variables, sparse):
+        exprs = [exprs] if isinstance(exprs, str) else list(exprs)
+        if not exprs:
+            raise ValueError("A system needs at least one equation.")
+        n = len(exprs)
+        variables = system_unknowns(n) if variables is None else tuple(variables)
+        if len(variables) != n:
+            raise ValueError("Need as many unknowns as equations.")
+        compiled = compile_expression(exprs, (variables,))
+        self._f = compiled.func
+        self.rows, self.cols, self._values = compiled.sparse_jacobian(variables)
+        self.n = n
+        if sparse == 'auto':
+            sparse = n >= SPARSE_MIN_SIZE and len(self.rows) <= SPARSE_MAX_DENSITY * n * n
+        self.sparse = bool(sparse)
+        self.jacobian_evaluations = 0
+
+    def f(self, x):
+        return np.asarray(self._f(x), dtype=float).reshape(self.n)
+
+    def factorize(self, x):
+        """LU factorization of the Jacobian at `x`; returns a solve function."""
+        self.jacobian_evaluations += 1
+        values = np.asarray(self._values(x), dtype=float).reshape(-1)
+        if not np.all(np.isfinite(values)):
+            raise ValueError("Jacobian is not finite at the current iterate.")
+        if self.sparse:
+            jacobian = scipy_sparse.csc_matrix((values, (self.rows, self.cols)), shape=(self.n, self.n))
+            try:
+                return scipy_sparse_linalg.splu(jacobian).solve
+            except RuntimeError:
+                raise ValueError("Jacobian is singular at the current iterate.") from None
+        jacobian = np.zeros((self.n, self.n))
+        jacobian[self.rows, self.cols] = values
+        with warnings.catch_warnings():
+            # A singular matrix is reported below as a ValueError instead.
+            warnings.simplefilter('ignore', scipy_linalg.LinAlgWarning)
+            lu = scipy_linalg.lu_factor(jacobian, check_finite=False)
+        if not np.all(np.diag(lu[0])):
+            raise ValueError("Jacobian is singular at the current iterate.")
+        return lambda b: scipy_linalg.lu_solve(lu, b, check_finite=False)
+
+
+def newton_system(exprs, x0, variables=None, tol=1e-10, max_iterations=50, update='broyden',
+                  sparse='auto', reuse_ratio=0.5, max_updates=20):
+    """Solve the square system `exprs = 0` starting from `x0`.
+
+    `exprs` is a list of expressions in `variables` (default x1, ..., xn).
+    Converges when the 2-norm of the residual is at most `tol` or the step
+    is below `tol` relative to `x`.  A reused factorization is dropped when
+    a step reduces the residual norm by less than `reuse_ratio`, and with
+    Broyden updates after `max_updates` of them.  `sparse` is True, False
+    or 'auto'.
+
+    Returns a `SystemResult` with the solution, the number of accepted
+    steps, the residual norm before each step and after the last, and the
+    number of Jacobian evaluations.
+    """
+    if update not in UPDATES:
+        raise ValueError(f"Unknown update: {update}")
+    system = _System(exprs, variables, sparse)
+    x = np.asarray(x0, dtype=float).reshape(-1)
+    if x.shape != (system.n,):
+        raise ValueError("Need one initial value per unknown.")
+
+    residual = system.f(x)
+    norms = [float(np.linalg.norm(residual))]
+    solve = None
+    steps = []
+    iterations = 0
+    while norms[-1] > tol:
+        if iterations >= max_iterations:
+            raise ValueError(f"Newton iteration did not converge in {max_iterations} iterations "
+                             f"(residual norm {norms[-1]:g}).")
+        fresh = solve is None
+        if fresh:
+            solve = system.factorize(x)
+            steps = []
+        step = -solve(residual)
+        if steps:
+            # Broyden's updates of the inverse Jacobian in product form, so
+            # only the steps since the factorization are stored.
+            for previous, current in zip(steps, steps[1:]):
+                step += current * (previous @ step) / (previous @ previous)
+            step /= 1 - (steps[-1] @ step) / (steps[-1] @ steps[-1])
+
+        trial = x + step
+        trial_residual = system.f(trial) if np.all(np.isfinite(trial)) else None
+        norm = float(np.linalg.norm(trial_residual)) if trial_residual is not None else np.inf
+        if not np.isfinite(norm) or (not fresh and norm > reuse_ratio * norms[-1]):
+            if fresh:
+                raise ValueError("Newton iteration diverged; try a better initial guess.")
+            # The old factorization no longer contracts fast enough.
+            solve = None
+            continue
+
+        x, residual = trial, trial_residual
+        norms.append(norm)
+        iterations += 1
+        if np.max(np.abs(step)) <= tol * (1 + np.max(np.abs(x))):
+            break
+        if update == 'newton' or (update == 'broyden' and len(steps) >= max_updates):
+            solve = None
+        elif update == 'broyden':
+            steps.append(step)
+    return SystemResult(x, iterations, norms, system.jacobian_evaluations)
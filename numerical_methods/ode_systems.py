@@ -0,0 +1,84 @@
+"""Euler and RK4 integration of systems `dy_i/dx = expr_i(x, y1, ..., yn)`.
+
+The list of right-hand sides is lambdified into a single callable taking
+`(x, y)` with `y` an array, so a step is one Python call regardless of
+the number of equations.  The front ends take a system as right-hand sides
+separated by semicolons and initial values separated by commas, e.g.
+`y2; -y1` with `1, 0` (see `parse_system`).
+"""
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.expression_cache import compile_expression
+
+np = lazy_import('numpy')
+
+
+def system_variables(n):
+    """Variables a system of `n` equations is compiled over: x and (y1, ..., yn)."""
+    return ('x', tuple(f'y{i}' for i in range(1, n + 1)))
+
+
+def compile_system(exprs):
+    """Compile a list of right-hand sides into `f(x, y) -> ndarray`."""
+    exprs = list(exprs)
+    if not exprs:
+        raise ValueError("A system needs at least one equation.")
+    func = compile_expression(exprs, system_variables(len(exprs))).func
+
+    def rhs(x, y):
+        return np.asarray(func(x, y), dtype=float)
+
+    return rhs
+
+
+def parse_system(expr_text, y0_text):
+    """Right-hand sides and initial values as typed into a front end.
+
+    A single equation in `y` gives `(expr, y0)` with a float `y0`; several
+    equations in `y1, ..., yn` give a list of expressions and a list of
+    initial values, ready for `compile_system`.
+    """
+    exprs = [e.strip() for e in expr_text.split(';') if e.strip()]
+    values = [float(v) for v in y0_text.split(',') if v.strip()]
+    if not exprs:
+        raise ValueError("Enter at least one equation.")
+    if len(values) != len(exprs):
+        raise ValueError("Need one initial value per equation.")
+    if len(exprs) == 1:
+        return exprs[0], values[0]
+    return exprs, values
+
+
+def _system_setup(exprs, y0, x0, x_end, h):
+    if x_end <= x0:
+        raise ValueError("End of interval must be greater than start.")
+    if h <= 0:
+        raise ValueError("Step size must be positive.")
+    y0 = np.asarray(y0, dtype=float)
+    if y0.shape != (len(exprs),):
+        raise ValueError("Need one initial value per equation.")
+
+    x = np.arange(x0, x_end, h)
+    y = np.zeros((len(x), len(exprs)))
+    y[0] = y0
+    return compile_system(exprs), x, y
+
+
+def euler_system(exprs, y0, x0, x_end, h):
+    """Euler method for a system; returns `x` and a `(steps, n)` state array."""
+    f, x, y = _system_setup(exprs, y0, x0, x_end, h)
+    for i in range(1, len(x)):
+        y[i] = y[i - 1] + h * f(x[i - 1], y[i - 1])
+    return x, y
+
+
+def runge_kutta_4_system(exprs, y0, x0, x_end, h):
+    """Fourth-order Runge-Kutta method for a system of equations."""
+    f, x, y = _system_setup(exprs, y0, x0, x_end, h)
+    for i in range(1, len(x)):
+        k1 = h * f(x[i - 1], y[i - 1])
+        k2 = h * f(x[i - 1] + h / 2, y[i - 1] + k1 / 2)
+        k3 = h * f(x[i - 1] + h / 2, y[i - 1] + k2 / 2)
+        k4 = h * f(x[i - 1] + h, y[i - 1] + k3)
+        y[i] = y[i - 1] + (k1 + 2 * k2 + 2 * k3 + k4) / 6
+    return x, y
@@ -0,0 +1,99 @@
+"""Roots of `expr(x, p) = 0` along a sweep of the parameter `p`.
+
+The expression is lambdified once with the parameters as extra arguments.
+Each parameter value is then solved starting from the root found at the
+previous value (natural-parameter continuation).  Neighbouring roots are
+close, so Newton's method typically needs two or three iterations per
+point instead of the dozen a cold start takes:
+
+* `method='newton'` starts Newton's method at the previous root.
+* `method='illinois'` brackets the previous root with a window twice as
+  wide as the last change of the root, widening it until the sign
+  changes, and refines it with the Illinois method.
+
+A point that fails to converge is reported with a NaN root and the next
+point starts again from the last root that did converge.
+"""
+
+from collections import namedtuple
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.expression_cache import bind_parameters, compile_expression
+from numerical_methods.scalar_roots import CONVERGED, scalar_illinois, scalar_newton
+
+np = lazy_import('numpy')
+
+SweepResult = namedtuple('SweepResult', ['values', 'roots', 'iterations', 'converged'])
+
+SWEEP_METHODS = ('newton', 'illinois')
+# Doublings of the bracket around the previous root before giving up.
+MAX_BRACKET_DOUBLINGS = 40
+
+
+def _bracket_around(f, x, half_width):
+    """Widen `[x - w, x + w]` until `f` changes sign; None if it never does."""
+    for _ in range(MAX_BRACKET_DOUBLINGS):
+        a, b = x - half_width, x + half_width
+        fa, fb = f(a), f(b)
+        if fa * fb < 0:
+            return a, b, fa, fb
+        half_width *= 2
+    return None
+
+
+def sweep_roots(expr, parameter, values, x0=None, bracket=None, tolerance=1e-10, max_iterations=50,
+                method='newton', params=None):
+    """Solve `expr = 0` for `x` at every value of the symbol `parameter`.
+
+    `values` are visited in the given order, so they should change
+    gradually.  Newton's method needs the starting guess `x0` for the first
+    value; the Illinois method needs a `bracket` `(a, b)` around its root.
+    `params` fixes any further symbols in `expr`.
+
+    Returns a `SweepResult` of arrays: the parameter values, the roots, the
+    iterations spent on each value and whether it converged.
+    """
+    if method not in SWEEP_METHODS:
+        raise ValueError(f"Unknown sweep method: {method}")
+    if method == 'newton' and x0 is None:
+        raise ValueError("Newton continuation needs an initial guess x0.")
+    if method == 'illinois' and bracket is None:
+        raise ValueError("Illinois continuation needs an initial bracket (a, b).")
+    params = params or {}
+    values = np.asarray(values, dtype=float).reshape(-1)
+    tolerance = float(tolerance)
+    max_iterations = int(max_iterations)
+
+    compiled = compile_expression(expr, ('x', parameter) + tuple(params))
+    roots = np.full(values.size, np.nan)
+    iterations = np.zeros(values.size, dtype=int)
+    converged = np.zeros(values.size, dtype=bool)
+
+    previous = None
+    change = None
+    for i, value in enumerate(values):
+        fixed = {parameter: value, **params}
+        if method == 'newton':
+            guess = float(x0) if previous is None else previous
+            result = scalar_newton(bind_parameters(compiled.fused(var='x'), fixed), guess,
+                                   tolerance, max_iterations)
+        else:
+            f = bind_parameters(compiled.func, fixed)
+            if previous is None:
+                a, b = float(bracket[0]), float(bracket[1])
+                found = (a, b, f(a), f(b))
+                if found[2] * found[3] >= 0:
+                    found = None
+            else:
+                found = _bracket_around(f, previous, 2 * max(change or 0.0, tolerance))
+            result = scalar_illinois(f, *found, tolerance, max_iterations) if found else None
+
+        if result is None:
+            continue
+        iterations[i] = result.iterations
+        if result.status == CONVERGED:
+            roots[i] = result.root
+            converged[i] = True
+            change = abs(result.root - previous) if previous is not None else change
+            previous = result.root
+    return SweepResult(values, roots, iterations, converged)
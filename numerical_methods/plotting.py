@@ -0,0 +1,311 @@
+"""Plotting of long trajectories at a cost that scales with screen width.
+
+A million-step trajectory drawn point by point costs minutes and
+gigabytes while the screen only has a few thousand pixel columns.  The
+downsamplers reduce the visible part of a trajectory to a few points per
+pixel column while keeping its shape:
+
+* `minmax_downsample` keeps the minimum and maximum of each bucket, so
+  spikes and the envelope of oscillations survive exactly.
+* `lttb_downsample` (Largest Triangle Three Buckets) keeps one point per
+  bucket, the one spanning the largest triangle with its neighbours.
+
+`DownsampledLine` holds the full data and redraws only the downsampled
+visible window whenever the x-limits change, so zooming in recovers full
+detail.  `plot_trajectory` draws into one persistent figure and axes that
+are reused between calls instead of opening a new figure each time.
+
+`LiveTrajectoryPlot` follows a trajectory while a solver is still
+producing it, redrawing at most `max_fps` times per second with blitting.
+"""
+
+import time
+
+from numerical_methods._lazy import lazy_import
+
+np = lazy_import('numpy')
+plt = lazy_import('matplotlib.pyplot')
+
+FIGURE_LABEL = 'Numerical methods'
+
+
+def minmax_downsample(x, y, buckets):
+    """Keep the first and last point and the minimum and maximum of each bucket.
+
+    Returns at most `2 * buckets + 2` points in their original order.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    buckets = int(buckets)
+    if buckets < 1:
+        raise ValueError("Number of buckets must be positive.")
+    if n <= 2 * buckets + 2:
+        return x, y
+
+    size = -(-n // buckets)
+    rows = -(-n // size)
+    values = np.asarray(y, dtype=float)
+    # Pad the last bucket so every bucket is a row; NaNs never win.
+    low = np.full(rows * size, np.inf)
+    high = np.full(rows * size, -np.inf)
+    finite = ~np.isnan(values)
+    low[:n] = np.where(finite, values, np.inf)
+    high[:n] = np.where(finite, values, -np.inf)
+    offsets = np.arange(rows) * size
+    lows = low.reshape(rows, size).argmin(axis=1) + offsets
+    highs = high.reshape(rows, size).argmax(axis=1) + offsets
+
+    keep = np.unique(np.concatenate([[0, n - 1], lows, highs]))
+    keep = keep[keep < n]
+    return x[keep], y[keep]
+
+
+def lttb_downsample(x, y, threshold):
+    """Largest Triangle Three Buckets downsampling to `threshold` points."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    threshold = int(threshold)
+    if threshold < 3:
+        raise ValueError("Threshold must be at least 3.")
+    if n <= threshold:
+        return x, y
+
+    xf = np.asarray(x, dtype=float)
+    yf = np.asarray(y, dtype=float)
+    # First and last points are kept; the rest is split into equal buckets.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+    selected = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = xf[stop:edges[i + 2]].mean()
+            next_y = yf[stop:edges[i + 2]].mean()
+        else:
+            next_x, next_y = xf[-1], yf[-1]
+        ax, ay = xf[selected], yf[selected]
+        # Twice the triangle area; the constant factor does not change the argmax.
+        area = np.abs((ax - next_x) * (yf[start:stop] - ay) - (ax - xf[start:stop]) * (next_y - ay))
+        selected = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = selected
+    return x[keep], y[keep]
+
+
+DOWNSAMPLERS = {
+    'minmax': lambda x, y, pixels: minmax_downsample(x, y, pixels),
+    'lttb': lambda x, y, pixels: lttb_downsample(x, y, max(3, 2 * pixels)),
+}
+
+
+class DownsampledLine:
+    """A line on `ax` that shows the full data downsampled to the axes width.
+
+    The data must be sorted by x.  Whenever the x-limits change the visible
+    window is downsampled again, so the number of drawn points stays
+    proportional to the axes width in pixels.  Markers (e.g. 'o-') are only
+    drawn when the visible window is not downsampled.
+    """
+
+    def __init__(self, ax, x, y, fmt='-', method='minmax', **kwargs):
+        if method not in DOWNSAMPLERS:
+            raise ValueError(f"Unknown downsampling method: {method}")
+        self.ax = ax
+        self.method = method
+        (self.line,) = ax.plot([], [], fmt, **kwargs)
+        self.marker = self.line.get_marker()
+        self._updating = False
+        self.set_data(x, y)
+        # A bound method would only be held weakly; the lambda keeps this line
+        # alive for as long as the axes are.
+        self._cid = ax.callbacks.connect('xlim_changed', lambda ax: self._on_xlim_changed(ax))
+
+    def set_data(self, x, y):
+        """Replace the full data and rescale the axes to it."""
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        if len(self.x) != len(self.y):
+            raise ValueError("x and y must have the same length.")
+        if len(self.x):
+            finite = self.y[np.isfinite(self.y)]
+            if finite.size:
+                self.ax.update_datalim([(self.x[0], finite.min()), (self.x[-1], finite.max())])
+                self.ax.autoscale_view()
+        self.refresh()
+
+    def visible(self):
+        """Indices `(start, stop)` of the data inside the current x-limits, plus one point each side."""
+        low, high = sorted(self.ax.get_xlim())
+        start = max(int(np.searchsorted(self.x, low, 'left')) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, high, 'right')) + 1, len(self.x))
+        return start, stop
+
+    def refresh(self):
+        """Downsample the visible window to the current axes width."""
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            start, stop = self.visible()
+            pixels = max(int(self.ax.bbox.width), 1)
+            x, y = self.x[start:stop], self.y[start:stop]
+            downsampled = len(x) > 2 * pixels
+            if downsampled:
+                x, y = DOWNSAMPLERS[self.method](x, y, pixels)
+            self.line.set_marker('None' if downsampled else self.marker)
+            self.line.set_data(x, y)
+        finally:
+            self._updating = False
+
+    def _on_xlim_changed(self, ax):
+        self.refresh()
+        ax.figure.canvas.draw_idle()
+
+    def remove(self):
+        self.ax.callbacks.disconnect(self._cid)
+        self.line.remove()
+
+
+def trajectory_axes(label=FIGURE_LABEL):
+    """The persistent axes of the figure `label`, created on first use."""
+    figure = plt.figure(label)
+    return figure.axes[0] if figure.axes else figure.add_subplot()
+
+
+def plot_trajectory(x, y, title, ax=None, fmt='o-', method='minmax', show=True):
+    """Plot a trajectory downsampled to the screen on a reused figure.
+
+    Without `ax` the persistent axes from `trajectory_axes` are cleared and
+    reused.  Returns the `DownsampledLine`, or a list of them, one per
+    component, when `y` is the `(steps, n)` state of a system.
+    """
+    if ax is None:
+        ax = trajectory_axes()
+    ax.cla()
+    y = np.asarray(y)
+    if y.ndim == 2:
+        line = [DownsampledLine(ax, x, y[:, i], fmt, method=method, label=f'y{i + 1}')
+                for i in range(y.shape[1])]
+    else:
+        line = DownsampledLine(ax, x, y, fmt, method=method, label=title)
+    ax.set_title(title)
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.legend()
+    ax.grid(True)
+    if show:
+        plt.show()
+    return line
+
+
+class LiveTrajectoryPlot:
+    """Blitted plot of a trajectory that another thread is still appending to.
+
+    The solver appends to the lists `x_vals` and `y_vals` (x first); a
+    canvas timer reads the new points at most `max_fps` times per second.
+    Points are reduced as they arrive to the minimum and maximum of each
+    pixel column of `[x0, x_end]`, so a frame costs the same no matter how
+    long the trajectory already is.  Only the line is redrawn on top of a
+    cached background unless the y-limits have to grow.
+    """
+
+    def __init__(self, ax, x_vals, y_vals, x0, x_end, title=None, max_fps=30):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.x_vals = x_vals
+        self.y_vals = y_vals
+        self.x0 = float(x0)
+        self.span = float(x_end) - self.x0 or 1.0
+        self.min_interval = 1.0 / max_fps
+        self.count = 0
+        self.frames = 0
+
+        ax.cla()
+        ax.set_xlim(self.x0, self.x0 + self.span)
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
+        ax.grid(True)
+        if title is not None:
+            ax.set_title(title)
+        self.columns = max(int(ax.bbox.width), 1)
+        self.lows = np.full(self.columns, np.inf)
+        self.highs = np.full(self.columns, -np.inf)
+        self.ylim = None
+        (self.line,) = ax.plot([], [], animated=True)
+
+        self._background = None
+        self._last_draw = 0.0
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.timer = self.canvas.new_timer(interval=int(1000 * self.min_interval))
+        self.timer.add_callback(self.refresh)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        """Stop following, show the last points and keep the line as a normal artist."""
+        self.timer.stop()
+        self.refresh(force=True)
+        self.canvas.mpl_disconnect(self._draw_cid)
+        self.line.set_animated(False)
+        self.canvas.draw_idle()
+
+    def _take_new_points(self):
+        # y is appended after x, so its length counts the complete points.
+        stop = len(self.y_vals)
+        if stop == self.count:
+            return False
+        x = np.asarray(self.x_vals[self.count:stop], dtype=float)
+        y = np.asarray(self.y_vals[self.count:stop], dtype=float)
+        self.count = stop
+
+        columns = ((x - self.x0) / self.span * self.columns).astype(int)
+        np.clip(columns, 0, self.columns - 1, out=columns)
+        finite = np.isfinite(y)
+        np.minimum.at(self.lows, columns[finite], y[finite])
+        np.maximum.at(self.highs, columns[finite], y[finite])
+        return True
+
+    def _line_data(self):
+        filled = np.flatnonzero(self.highs >= self.lows)
+        x = self.x0 + (filled + 0.5) * (self.span / self.columns)
+        return np.repeat(x, 2), np.column_stack((self.lows[filled], self.highs[filled])).ravel()
+
+    def _grow_ylim(self, y):
+        """Widen the y-limits with some headroom when `y` leaves them; True if they changed."""
+        if not y.size:
+            return False
+        low, high = float(y.min()), float(y.max())
+        if self.ylim is not None and self.ylim[0] <= low and high <= self.ylim[1]:
+            return False
+        if self.ylim is not None:
+            low, high = min(low, self.ylim[0]), max(high, self.ylim[1])
+        margin = 0.1 * (high - low) or 0.5 * abs(high) or 1.0
+        self.ylim = (low - margin, high + margin)
+        self.ax.set_ylim(*self.ylim)
+        return True
+
+    def refresh(self, force=False):
+        """Draw the points appended since the last frame, throttled to `max_fps`."""
+        now = time.perf_counter()
+        if not force and now - self._last_draw < self.min_interval:
+            return
+        if not self._take_new_points() and not force:
+            return
+        self._last_draw = now
+        x, y = self._line_data()
+        self.line.set_data(x, y)
+        self.frames += 1
+        if self._grow_ylim(y) or self._background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self.ax.draw_artist(self.line)
+            self.canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
@@ -0,0 +1,269 @@
+"""Fast path for polynomial expressions.
+
+Polynomials with numeric coefficients are evaluated with Horner's scheme,
+their derivative comes from the same pass by synthetic division, and all
+of their roots are the eigenvalues of the companion matrix, so no
+iteration or bracketing is needed.
+
+Only polynomials that are written out in expanded form take the Horner
+path (see `horner_coefficients`).  Expanding a factored form such as
+`(x - 1)**7` would trade its accurate evaluation near the root for one
+that cancels catastrophically there.
+"""
+
+import math
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.scalar_roots import scalar_newton
+
+np = lazy_import('numpy')
+sp = lazy_import('sympy')
+
+# Higher degrees stay with lambdify: straight-line Horner code grows with
+# the degree and sparse polynomials such as x**20000 - 2 are cheaper as
+# written.
+HORNER_MAX_DEGREE = 64
+# Smale's alpha test: a point with alpha below this constant converges
+# quadratically under Newton's method to a simple root within twice its
+# Newton step.
+ALPHA_0 = (13 - 3 * 17 ** 0.5) / 4
+# The eigenvalues of a k-fold root scatter by about the perturbation
+# (rounding error / |p^(k) / k!|)**(1/k); clusters up to this factor wider
+# are still taken for one multiple root.
+PERTURBATION_FACTOR = 2
+
+
+def _degree_bound(expr, var):
+    """Upper bound on the degree of the polynomial `expr` in `var`, without expanding it."""
+    if not expr.has(var):
+        return 0
+    if expr == var:
+        return 1
+    if expr.is_Add:
+        return max(_degree_bound(arg, var) for arg in expr.args)
+    if expr.is_Mul:
+        return sum(_degree_bound(arg, var) for arg in expr.args)
+    if expr.is_Pow:
+        return int(expr.exp) * _degree_bound(expr.base, var)
+    return sp.degree(expr, var)
+
+
+def polynomial_coefficients(expr, var='x', max_degree=None):
+    """Coefficients of `expr` in `var`, highest degree first, or None.
+
+    None is returned for anything that is not a polynomial in `var` with
+    real numeric coefficients, or of degree above `max_degree`.
+    """
+    var = sp.Symbol(var) if isinstance(var, str) else var
+    expr = sp.sympify(expr)
+    if not isinstance(expr, sp.Expr) or not expr.free_symbols <= {var}:
+        return None
+    if not expr.is_polynomial(var):
+        return None
+    if max_degree is not None and _degree_bound(expr, var) > max_degree:
+        return None
+    try:
+        coeffs = sp.Poly(expr, var).all_coeffs()
+        return np.array([float(c) for c in coeffs])
+    except (sp.PolynomialError, TypeError, OverflowError):
+        return None
+
+
+def horner_coefficients(expr, var='x', max_degree=HORNER_MAX_DEGREE):
+    """Coefficients for Horner evaluation of `expr`, or None.
+
+    Like `polynomial_coefficients`, but only for polynomials that are
+    already in expanded form, so evaluating the coefficients rounds the
+    same way as evaluating `expr` itself.
+    """
+    var = sp.Symbol(var) if isinstance(var, str) else var
+    expr = sp.sympify(expr)
+    if not isinstance(expr, sp.Expr) or not expr.free_symbols <= {var} or not expr.is_polynomial(var):
+        return None
+    if _degree_bound(expr, var) > max_degree or expr != sp.expand(expr):
+        return None
+    return polynomial_coefficients(expr, var)
+
+
+def horner(coeffs, x):
+    """Evaluate the polynomial with the given coefficients at `x`."""
+    p = coeffs[0]
+    for c in coeffs[1:]:
+        p = p * x + c
+    return p
+
+
+def horner_with_derivative(coeffs, x):
+    """Evaluate the polynomial and its derivative in one Horner pass."""
+    p = coeffs[0]
+    dp = 0.0
+    for c in coeffs[1:]:
+        dp = dp * x + p
+        p = p * x + c
+    return p, dp
+
+
+def compile_horner(coeffs, derivative=False):
+    """Generate straight-line Horner code for the polynomial.
+
+    Returns `f(x)`, or with `derivative=True` a callable returning
+    `[p(x), p'(x)]` computed together by synthetic division.  Unrolling the
+    loop avoids per-coefficient interpreter overhead on scalar calls.
+    """
+    coeffs = [float(c) for c in coeffs]
+    lines = ['def _horner(x):', f'    p = {coeffs[0]!r}', '    dp = 0.0']
+    for i, c in enumerate(coeffs[1:]):
+        if derivative:
+            lines.append('    dp = p' if i == 0 else '    dp = dp * x + p')
+        lines.append(f'    p = p * x + {c!r}')
+    lines.append('    return [p, dp]' if derivative else '    return p')
+    namespace = {}
+    exec(compile('\n'.join(lines), '<horner>', 'exec'), namespace)
+    return namespace['_horner']
+
+
+def companion_matrix(coeffs):
+    """Companion matrix whose eigenvalues are the roots of the polynomial."""
+    coeffs = np.trim_zeros(np.asarray(coeffs, dtype=float), 'f')
+    if coeffs.size < 2:
+        raise ValueError("Polynomial must have degree at least one.")
+    n = coeffs.size - 1
+    matrix = np.zeros((n, n))
+    matrix[0] = -coeffs[1:] / coeffs[0]
+    matrix[1:, :-1] = np.eye(n - 1)
+    return matrix
+
+
+def polynomial_roots(coeffs):
+    """All (complex) roots of the polynomial."""
+    coeffs = np.trim_zeros(np.asarray(coeffs, dtype=float), 'f')
+    # Zero roots are exact; deflating them keeps the eigenproblem smaller.
+    stripped = np.trim_zeros(coeffs, 'b')
+    zeros = np.zeros(coeffs.size - stripped.size, dtype=complex)
+    if stripped.size < 2:
+        return zeros
+    return np.concatenate([np.linalg.eigvals(companion_matrix(stripped)), zeros])
+
+
+def _rounding_error(coeffs, x):
+    """Typical size of the rounding error of evaluating the polynomial at `x`."""
+    return np.finfo(float).eps * np.polyval(np.abs(coeffs), np.abs(x))
+
+
+def _root_radius(coeffs, x, k):
+    """Radius around `x` within which a k-fold root cannot be located in double precision."""
+    scale = np.abs(np.polyval(np.polyder(coeffs, k), x)) / math.factorial(k)
+    with np.errstate(divide='ignore'):
+        return (_rounding_error(coeffs, x) / scale) ** (1 / k)
+
+
+def _polish(coeffs, x, tolerance, max_iterations=50):
+    """Newton's method on the polynomial from `x` until the step is below `tolerance` (relative).
+
+    Stops early, before taking it, at the first step longer than the one
+    before, as the steps do in the rounding noise around a multiple root.
+    """
+    return scalar_newton(lambda z: horner_with_derivative(coeffs, z), x, tolerance * max(1, abs(x)),
+                         max_iterations, stop_on_growth=True).root
+
+
+def _simple_root_radius(coeffs, x):
+    """Distance from each of the points `x` to the simple root it converges to, or inf.
+
+    Uses Smale's alpha test with the Newton step `beta` enlarged by the
+    rounding error of `p`; points near a multiple root fail it.
+    """
+    dp = np.abs(np.polyval(np.polyder(coeffs), x))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = (np.abs(np.polyval(coeffs, x)) + _rounding_error(coeffs, x)) / dp
+        gamma = np.max([(np.abs(np.polyval(np.polyder(coeffs, k), x)) / math.factorial(k) / dp) ** (1 / (k - 1))
+                        for k in range(2, len(coeffs))] or [np.zeros_like(dp)], axis=0)
+        return np.where(beta * gamma < ALPHA_0, 2 * beta, np.inf)
+
+
+def _resolved(polished, radii):
+    """True if the polished points lie within `radii` of simple roots that are all different."""
+    distances = np.abs(polished[:, None] - polished[None, :])
+    np.fill_diagonal(distances, np.inf)
+    return bool(np.all(distances > np.add.outer(radii, radii)))
+
+
+def _multiple_root(coeffs, points, tolerance):
+    """The root of multiplicity `len(points)` the polished eigenvalues `points` scatter around, or None.
+
+    The root is a simple root of the (k-1)-th derivative, so Newton's
+    method on that derivative finds it to full accuracy.  The group is
+    accepted when the scatter of the points around it matches the
+    expected perturbation of a k-fold root, and the polynomial and its
+    first k-1 derivatives vanish there to within their rounding error
+    scaled the same way (see `PERTURBATION_FACTOR`).
+    """
+    k = len(points)
+    root = _polish(np.polyder(coeffs, k - 1), complex(np.mean(points)), tolerance)
+    spread = np.abs(points - root).max()
+    if spread > max(tolerance * max(1, abs(root)), PERTURBATION_FACTOR * _root_radius(coeffs, root, k)):
+        return None
+    for j in range(k - 1):
+        derivative = np.polyder(coeffs, j)
+        if abs(np.polyval(derivative, root)) > PERTURBATION_FACTOR ** (k - j) * _rounding_error(derivative, root):
+            return None
+    return root
+
+
+def _split(points):
+    """Indices of `points` in two or more groups, cut at the widest gaps between them."""
+    distances = np.abs(points[:, None] - points[None, :])
+    radius = distances.max()
+    while True:
+        radius /= 2
+        near = distances <= radius
+        groups = []
+        unvisited = set(range(len(points)))
+        while unvisited:
+            group = [unvisited.pop()]
+            for i in group:
+                linked = [j for j in np.flatnonzero(near[i]) if j in unvisited]
+                unvisited.difference_update(linked)
+                group.extend(linked)
+            groups.append(group)
+        if len(groups) > 1:
+            return groups
+
+
+def _cluster_roots(coeffs, polished, radii, tolerance):
+    """Complex roots from the Newton-polished eigenvalues `polished`.
+
+    A group collapses into one multiple root only when Newton's method
+    did not converge from its members to separate simple roots and their
+    scatter is that of a multiple root; otherwise it is split at its
+    widest gaps and each part is tried again, down to single points.
+    """
+    if len(polished) == 1 or _resolved(polished, radii):
+        return list(polished)
+    root = _multiple_root(coeffs, polished, tolerance)
+    if root is not None:
+        return [root]
+    roots = []
+    for group in _split(polished):
+        roots.extend(_cluster_roots(coeffs, polished[group], radii[group], tolerance))
+    return roots
+
+
+def real_polynomial_roots(coeffs, tolerance=1e-10, imag_tolerance=1e-7):
+    """Sorted distinct real roots, refined to `tolerance`.
+
+    Every eigenvalue is polished by Newton's method first.  A multiple
+    root comes back from the eigensolver as a cluster scattered around it,
+    partly with imaginary parts, that Newton's method cannot separate; such
+    a cluster is replaced by a single root refined on the matching
+    derivative (see `_cluster_roots`).
+    """
+    coeffs = np.trim_zeros(np.asarray(coeffs, dtype=float), 'f')
+    points = polynomial_roots(coeffs)
+    if not points.size:
+        return np.zeros(0)
+    polished = np.array([_polish(coeffs, complex(z), tolerance) for z in points])
+    radii = _simple_root_radius(coeffs, polished)
+    roots = np.array(_cluster_roots(coeffs, polished, radii, tolerance), dtype=complex)
+    real = roots.real[np.abs(roots.imag) <= imag_tolerance * np.maximum(1, np.abs(roots))]
+    return np.sort(real)
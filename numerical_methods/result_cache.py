@@ -0,0 +1,258 @@
+"""Opt-in persistent cache of solver results in a local SQLite file.
+
+Results are keyed on the canonical SymPy form of the expression, the
+method name and its numeric parameters, so `x**2 - 2` and `-2 + x**2`
+with the same bracket and tolerance share one entry.  Scalars, lists and
+the solvers' result tuples are stored as JSON; NumPy arrays (trajectories)
+are stored next to them as one `.npz` blob.  When the stored results
+exceed `max_bytes` the least recently used ones are evicted.
+
+The cache is off unless a path is given or the environment variable
+`NUMERICAL_METHODS_CACHE` names the database file:
+
+    cache = open_cache()                    # disabled unless the variable is set
+    root = cache.get_or_compute('bisection', 'x**3 - x - 2', {'a': 1, 'b': 2},
+                                lambda: bisection_method(f, 1, 2))
+"""
+
+import hashlib
+import importlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from functools import lru_cache
+
+from numerical_methods._lazy import lazy_import
+
+np = lazy_import('numpy')
+sp = lazy_import('sympy')
+
+ENV_VAR = 'NUMERICAL_METHODS_CACHE'
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'numerical_methods', 'results.sqlite')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Rows fetched per round when evicting the least recently used results.
+EVICT_BATCH = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    expr TEXT NOT NULL,
+    value TEXT NOT NULL,
+    arrays BLOB,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+# Returned by `get` on a miss when no default is given to tell it apart.
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _canonical_text(expr):
+    return sp.srepr(sp.sympify(list(expr) if isinstance(expr, tuple) else expr))
+
+
+def canonical_expression(expr):
+    """`srepr` of the parsed expression (or list of expressions)."""
+    if isinstance(expr, (list, tuple)):
+        expr = tuple(expr)
+    if isinstance(expr, str) or (isinstance(expr, tuple) and all(isinstance(e, str) for e in expr)):
+        return _canonical_text(expr)
+    return sp.srepr(sp.sympify(expr))
+
+
+def _canonical_params(value):
+    if isinstance(value, dict):
+        return {str(k): _canonical_params(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical_params(v) for v in value]
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    # 1 and 1.0 are the same bracket.
+    return float(value)
+
+
+def cache_key(method, expr, params):
+    """Hex digest identifying one solve."""
+    text = json.dumps([method, canonical_expression(expr), _canonical_params(params)], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _encode(value, arrays):
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return {'__array__': len(arrays) - 1}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        cls = type(value)
+        return {'__namedtuple__': f'{cls.__module__}:{cls.__qualname__}',
+                'values': [_encode(v, arrays) for v in value]}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(v, arrays) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v, arrays) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _encode(v, arrays) for k, v in value.items()}
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    raise TypeError(f"Cannot cache a result of type {type(value).__name__}.")
+
+
+def _result_type(name):
+    """The namedtuple class `module:qualname`, only for this package's result types."""
+    module, _, qualname = name.partition(':')
+    if module.split('.')[0] != __name__.split('.')[0]:
+        return None
+    return getattr(importlib.import_module(module), qualname, None)
+
+
+def _decode(value, arrays):
+    if isinstance(value, list):
+        return [_decode(v, arrays) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if '__array__' in value:
+        return arrays[f"arr_{value['__array__']}"]
+    if '__tuple__' in value:
+        return tuple(_decode(v, arrays) for v in value['__tuple__'])
+    if '__namedtuple__' in value:
+        values = [_decode(v, arrays) for v in value['values']]
+        cls = _result_type(value['__namedtuple__'])
+        return cls(*values) if cls is not None else tuple(values)
+    return {k: _decode(v, arrays) for k, v in value.items()}
+
+
+class ResultCache:
+    """SQLite-backed store of solver results with least-recently-used eviction.
+
+    With `path=None` the cache is disabled: lookups always miss and nothing
+    is written.  Storage errors never fail a solve; they count as misses.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError("Cache size must be at least 1 byte.")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    connection.executescript(_SCHEMA)
+                    connection.commit()
+                    self._ready = True
+        return closing(connection)
+
+    def get(self, method, expr, params, default=None):
+        """The stored result, or `default` on a miss."""
+        if not self.enabled:
+            return default
+        key = cache_key(method, expr, params)
+        try:
+            with self._connect() as db, db:
+                row = db.execute('SELECT value, arrays FROM results WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    db.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        value, blob = row
+        arrays = np.load(io.BytesIO(blob), allow_pickle=False) if blob is not None else {}
+        return _decode(json.loads(value), arrays)
+
+    def put(self, method, expr, params, result):
+        """Store `result` and evict the least recently used entries over `max_bytes`."""
+        if not self.enabled:
+            return
+        arrays = []
+        value = json.dumps(_encode(result, arrays))
+        blob = None
+        if arrays:
+            buffer = io.BytesIO()
+            np.savez(buffer, *arrays)
+            blob = buffer.getvalue()
+        size = len(value) + (len(blob) if blob is not None else 0)
+        if size > self.max_bytes:
+            return
+        expr_text = expr if isinstance(expr, str) else json.dumps([str(e) for e in expr])
+        key = cache_key(method, expr, params)
+        try:
+            with self._connect() as db, db:
+                db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                           (key, method, expr_text, value, blob, size, time.time()))
+                self._evict(db)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, db):
+        excess = db.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0] - self.max_bytes
+        while excess > 0:
+            stale = []
+            for key, size in db.execute('SELECT key, size FROM results ORDER BY last_used LIMIT ?',
+                                        (EVICT_BATCH,)).fetchall():
+                if excess <= 0:
+                    break
+                stale.append((key,))
+                excess -= size
+            db.executemany('DELETE FROM results WHERE key = ?', stale)
+
+    def get_or_compute(self, method, expr, params, compute):
+        """The stored result of this solve, or `compute()` stored for next time.
+
+        Exceptions from `compute` propagate and nothing is stored.
+        """
+        result = self.get(method, expr, params, _MISSING)
+        if result is _MISSING:
+            result = compute()
+            self.put(method, expr, params, result)
+        return result
+
+    def size(self):
+        """Number of stored results and their total size in bytes."""
+        if not self.enabled:
+            return 0, 0
+        with self._connect() as db:
+            count, total = db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        return count, total
+
+    def clear(self):
+        if self.enabled:
+            with self._connect() as db, db:
+                db.execute('DELETE FROM results')
+        self.hits = self.misses = 0
+
+
+def open_cache(path=None, bypass=False, max_bytes=DEFAULT_MAX_BYTES):
+    """The result cache at `path`, else at `$NUMERICAL_METHODS_CACHE`.
+
+    Returns a disabled cache when neither is set or when `bypass` is true.
+    An empty environment variable selects `DEFAULT_PATH`.
+    """
+    if bypass:
+        return ResultCache(None, max_bytes)
+    if path is None and ENV_VAR in os.environ:
+        path = os.environ[ENV_VAR] or DEFAULT_PATH
+    if path is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return ResultCache(path, max_bytes)
@@ -0,0 +1,121 @@
+"""Find every root of an expression on an interval.
+
+The expression is sampled on a grid in one vectorized call.  Each sign
+change becomes a bracket and all brackets are refined together with
+`batch_bisection`.  Roots of even multiplicity do not change sign, so
+local minima of `|f|` on the grid are also refined, by running
+`batch_newton` on `f'`, and kept when `f` is (nearly) zero there.
+Polynomials of moderate degree, expanded or not, skip the scan and take
+their roots from the companion matrix; clusters of eigenvalues around a
+multiple root are merged into one root.
+"""
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.batch_roots import CONVERGED, batch_bisection, batch_newton
+from numerical_methods.expression_cache import compile_expression
+from numerical_methods.polynomial import HORNER_MAX_DEGREE, polynomial_coefficients, real_polynomial_roots
+
+np = lazy_import('numpy')
+
+
+def _scan(compiled, a, b, samples, tolerance, max_iterations, zero_tolerance, progress=None):
+    if progress is not None:
+        progress(0)
+    x = np.linspace(a, b, samples + 1)
+    y = np.broadcast_to(np.asarray(compiled.func(x), dtype=float), x.shape)
+    roots = [x[y == 0]]
+    if progress is not None:
+        progress(1 / 3)
+
+    brackets = np.flatnonzero(y[:-1] * y[1:] < 0)
+    if brackets.size:
+        # Bisect to the bracket width: near a multiple root |f| drops below
+        # any function tolerance long before x is accurate.
+        result = batch_bisection(x[brackets], x[brackets + 1], tolerance, max_iterations, compiled.expr,
+                                 f_tolerance=0)
+        roots.append(result.roots[result.converged])
+    if progress is not None:
+        progress(2 / 3)
+
+    # Interior grid points where |f| has a local minimum without a sign change
+    # are candidates for even-multiplicity roots.
+    magnitude = np.abs(y)
+    interior = np.arange(1, samples)
+    minima = interior[(magnitude[interior] < magnitude[interior - 1]) &
+                      (magnitude[interior] <= magnitude[interior + 1]) &
+                      (y[interior - 1] * y[interior + 1] > 0)]
+    if minima.size:
+        result = batch_newton(x[minima], tolerance, max_iterations, compiled.derivative_expr())
+        step = (b - a) / samples
+        candidates = result.roots[(result.status == CONVERGED) &
+                                  (np.abs(result.roots - x[minima]) <= step)]
+        values = np.broadcast_to(np.asarray(compiled.func(candidates), dtype=float), candidates.shape)
+        roots.append(candidates[np.abs(values) <= zero_tolerance])
+
+    return np.concatenate(roots)
+
+
+def _pass_progress(progress, done, passes):
+    """Scale a scan's own 0..1 progress into its share of the whole search."""
+    if progress is None:
+        return None
+    return lambda fraction: progress((done + fraction) / passes)
+
+
+def _deduplicate(roots, distance):
+    roots = np.sort(roots)
+    if roots.size < 2:
+        return roots
+    keep = np.concatenate([[True], np.diff(roots) > distance])
+    return roots[keep]
+
+
+def find_all_roots(expr, a, b, tolerance=1e-10, max_iterations=100, samples=1000,
+                   adaptive=False, max_refinements=6, zero_tolerance=1e-8, progress=None):
+    """Return the sorted roots of `expr` in `[a, b]`.
+
+    `samples` sets the grid density.  With `adaptive=True` the grid keeps
+    doubling until refinements stop finding new roots (or `max_refinements`
+    is reached), which catches closely spaced roots a coarse grid misses.
+    `progress`, if given, is called with the completed fraction between
+    stages of every scan.
+    """
+    a = float(a)
+    b = float(b)
+    samples = int(samples)
+    if b <= a:
+        raise ValueError("Upper bound must be greater than lower bound.")
+    if samples < 2:
+        raise ValueError("Need at least two grid intervals.")
+
+    compiled = compile_expression(expr, ('x',))
+    distance = 10 * tolerance
+    coefficients = compiled.coefficients
+    if coefficients is None:
+        # Factored polynomials are evaluated as written but still solved
+        # through their coefficients; roots closer than the grid spacing
+        # would hide from the scan.
+        coefficients = polynomial_coefficients(compiled.expr, max_degree=HORNER_MAX_DEGREE)
+    if coefficients is not None and coefficients.size > 1:
+        # Polynomials: every root at once from the companion matrix, no scan.
+        roots = real_polynomial_roots(coefficients, tolerance)
+        return _deduplicate(roots[(roots >= a) & (roots <= b)], distance)
+    passes = 1 + max_refinements if adaptive else 1
+    roots = _deduplicate(_scan(compiled, a, b, samples, tolerance, max_iterations, zero_tolerance,
+                               _pass_progress(progress, 0, passes)), distance)
+    if adaptive:
+        # Pairs of close roots can hide in one grid cell at two successive
+        # densities, so stop only after two refinements in a row add nothing.
+        unchanged = 0
+        for done in range(1, max_refinements + 1):
+            samples *= 2
+            refined = _deduplicate(_scan(compiled, a, b, samples, tolerance, max_iterations, zero_tolerance,
+                                         _pass_progress(progress, done, passes)), distance)
+            if refined.size > roots.size:
+                roots = refined
+                unchanged = 0
+            else:
+                unchanged += 1
+                if unchanged == 2:
+                    break
+    return roots
@@ -0,0 +1,78 @@
+"""Scalar Newton and Illinois iterations shared by the solvers.
+
+Both return a `ScalarResult(root, iterations, status)` instead of raising,
+so each caller decides what a failure means: the GUI reports it, a sweep
+marks the point as not converged and polishing keeps the last iterate.
+The status codes are the ones `batch_newton` reports per lane.
+"""
+
+import cmath
+from collections import namedtuple
+
+ScalarResult = namedtuple('ScalarResult', ['root', 'iterations', 'status'])
+
+# Status codes of a scalar or per-lane iteration.
+CONVERGED = 0
+MAX_ITERATIONS = 1
+ZERO_DERIVATIVE = 2
+DIVERGED = 3
+# Newton's method with `stop_on_growth` stopped before a longer step.
+STALLED = 4
+
+
+def scalar_newton(f_and_prime, x, tolerance, max_iterations, stop_on_growth=False, progress=None,
+                  report_every=1):
+    """Newton's method from `x`, with `f_and_prime(x)` returning `(f, f')`.
+
+    Converges once a step is shorter than `tolerance`.  A zero derivative
+    or a non-finite step stops at the last good iterate.  With
+    `stop_on_growth` a step longer than the one before is not taken: in
+    the rounding noise around a multiple root the steps stop shrinking and
+    would only carry the point away.  `progress`, if given, is called with
+    the fraction of `max_iterations` done every `report_every` iterations.
+    """
+    previous = float('inf')
+    for iteration in range(1, max_iterations + 1):
+        if progress is not None and (iteration - 1) % report_every == 0:
+            progress((iteration - 1) / max_iterations)
+        f_x, f_prime_x = f_and_prime(x)
+        if f_prime_x == 0:
+            return ScalarResult(x, iteration, ZERO_DERIVATIVE)
+        step = f_x / f_prime_x
+        if not cmath.isfinite(step):
+            return ScalarResult(x, iteration, DIVERGED)
+        if stop_on_growth and abs(step) >= previous:
+            return ScalarResult(x, iteration, STALLED)
+        x = x - step
+        previous = abs(step)
+        if previous < tolerance:
+            return ScalarResult(x, iteration, CONVERGED)
+    return ScalarResult(x, max_iterations, MAX_ITERATIONS)
+
+
+def scalar_illinois(f, a, b, fa, fb, tolerance, max_iterations):
+    """Illinois method on a bracket `[a, b]` with `fa * fb < 0`.
+
+    Regula falsi, except that when the same endpoint survives two
+    iterations in a row its function value is halved, which stops the
+    method from stagnating with one end fixed on convex functions.
+    Converges once `|f(c)|` or the bracket is below `tolerance`.
+    """
+    side = 0
+    c = a
+    for iteration in range(1, max_iterations + 1):
+        c = b - (fb * (b - a)) / (fb - fa)
+        fc = f(c)
+        if abs(fc) < tolerance or abs(b - a) < tolerance:
+            return ScalarResult(c, iteration, CONVERGED)
+        if fa * fc < 0:
+            b, fb = c, fc
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb /= 2
+            side = 1
+    return ScalarResult(c, max_iterations, MAX_ITERATIONS)
@@ -0,0 +1,136 @@
+"""Streaming Euler/RK4 trajectories with optional on-disk sinks.
+
+`iter_trajectory` yields the solution step by step or in fixed-size blocks
+instead of building the whole trajectory, so memory is bounded by the
+block size.  The sinks write those blocks straight to disk, either into a
+memory-mapped `.npy` file or an append-only raw float64 file.  Rows are
+`[x, y...]` in both cases.
+"""
+
+import math
+
+from numerical_methods._lazy import lazy_import
+from numerical_methods.ensemble_ode import STEPPERS
+
+np = lazy_import('numpy')
+
+
+def trajectory_length(x0, x_end, h, decimate=1):
+    """Number of rows produced for the grid `np.arange(x0, x_end, h)[::decimate]`."""
+    steps = max(0, math.ceil((x_end - x0) / h))
+    return math.ceil(steps / decimate)
+
+
+def iter_trajectory(method, f, y0, x0, x_end, h, block_size=None, decimate=1):
+    """Integrate `dy/dx = f(x, y)` lazily on the grid `x0, x0 + h, ... < x_end`.
+
+    `method` is 'euler' or 'runge_kutta_4' and `y0` may be a scalar or an
+    array for systems.  Only every `decimate`-th step is kept.  Without a
+    `block_size` each kept step is yielded as `(x, y)`; otherwise blocks of
+    up to `block_size` steps are yielded as `(x_block, y_block)` arrays.
+    """
+    if h <= 0:
+        raise ValueError("Step size must be positive.")
+    if decimate < 1:
+        raise ValueError("Decimation factor must be at least 1.")
+    if block_size is not None and block_size < 1:
+        raise ValueError("Block size must be positive.")
+    step = STEPPERS[method]
+    steps = max(0, math.ceil((x_end - x0) / h))
+    y = np.asarray(y0, dtype=float)
+
+    if block_size is not None:
+        x_block = np.empty(block_size)
+        y_block = np.empty((block_size,) + y.shape)
+        filled = 0
+
+    for i in range(steps):
+        x = x0 + i * h
+        if i:
+            y = step(f, x0 + (i - 1) * h, y, h, ())
+        if i % decimate:
+            continue
+        if block_size is None:
+            yield x, y
+            continue
+        x_block[filled] = x
+        y_block[filled] = y
+        filled += 1
+        if filled == block_size:
+            yield x_block.copy(), y_block.copy()
+            filled = 0
+
+    if block_size is not None and filled:
+        yield x_block[:filled].copy(), y_block[:filled].copy()
+
+
+class NpyMemmapSink:
+    """Writes trajectory blocks into a preallocated, memory-mapped `.npy` file."""
+
+    def __init__(self, path, rows, state_size=1):
+        self.path = path
+        self.data = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(rows, 1 + state_size))
+        self.rows_written = 0
+
+    def write(self, x_block, y_block):
+        rows = len(x_block)
+        end = self.rows_written + rows
+        if end > len(self.data):
+            raise ValueError("More rows written than the sink was sized for.")
+        self.data[self.rows_written:end, 0] = x_block
+        self.data[self.rows_written:end, 1:] = np.reshape(y_block, (rows, -1))
+        self.rows_written = end
+
+    def close(self):
+        if self.data is not None:
+            self.data.flush()
+            self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BinaryAppendSink:
+    """Appends trajectory blocks as raw float64 rows; read back with `read_binary_trajectory`."""
+
+    def __init__(self, path, state_size=1):
+        self.path = path
+        self.state_size = state_size
+        self._file = open(path, 'ab')
+        self.rows_written = 0
+
+    def write(self, x_block, y_block):
+        rows = np.column_stack([x_block, np.reshape(y_block, (len(x_block), -1))])
+        if rows.shape[1] != 1 + self.state_size:
+            raise ValueError("Block width does not match the sink's state size.")
+        self._file.write(np.ascontiguousarray(rows, dtype=np.float64).tobytes())
+        self.rows_written += len(rows)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_binary_trajectory(path, state_size=1, mmap=True):
+    """Load a file written by `BinaryAppendSink` as an `(rows, 1 + state_size)` array."""
+    if mmap:
+        return np.memmap(path, dtype=np.float64, mode='r').reshape(-1, 1 + state_size)
+    return np.fromfile(path, dtype=np.float64).reshape(-1, 1 + state_size)
+
+
+def integrate_to_sink(method, f, y0, x0, x_end, h, sink, block_size=4096, decimate=1):
+    """Stream a trajectory into `sink` block by block; returns the number of rows written."""
+    rows = 0
+    for x_block, y_block in iter_trajectory(method, f, y0, x0, x_end, h, block_size, decimate):
+        sink.write(x_block, y_block)
+        rows += len(x_block)
+    return rows
@@ -1,18 +1,14 @@
 # secant_method.py
 
-from sympy import symbols, lambdify, sympify
+from numerical_methods.expression_cache import bind_parameters, compile_expression
 
-# Define symbolic variables
-x = symbols('x')
-
-def secant_method(x0, x1, tolerance, max_iterations, expr):
+def secant_method(x0, x1, tolerance, max_iterations, expr, params=None):
     x0 = float(x0)
     x1 = float(x1)
     tolerance = float(tolerance)
     max_iterations = int(max_iterations)
-    expr = sympify(expr)
 
-    f = lambdify(x, expr, 'numpy')
+    f = bind_parameters(compile_expression(expr, ('x',) + tuple(params or ())).func, params)
 
     for _ in range(max_iterations):
         f_x0 = f(x0)
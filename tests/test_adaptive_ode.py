@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from numerical_methods.adaptive_ode import dormand_prince
+
+
+@pytest.mark.parametrize('rtol', [1e-4, 1e-8])
+def test_error_follows_the_tolerance(rtol):
+    result = dormand_prince(lambda x, y: y * np.cos(x), 1.0, 0.0, 3.0, rtol=rtol, atol=rtol * 1e-3)
+    assert result.x[-1] == pytest.approx(3.0)
+    assert result.y[-1] == pytest.approx(np.exp(np.sin(3.0)), rel=100 * rtol)
+
+
+def test_tighter_tolerance_takes_more_steps():
+    f = lambda x, y: -2 * x * y
+    loose = dormand_prince(f, 1.0, 0.0, 2.0, rtol=1e-4)
+    tight = dormand_prince(f, 1.0, 0.0, 2.0, rtol=1e-10)
+    assert tight.accepted_steps > loose.accepted_steps
+    assert tight.evaluations >= 6 * (tight.accepted_steps + tight.rejected_steps)
+
+
+def test_system():
+    result = dormand_prince(lambda x, y: np.array([y[1], -y[0]]), [1.0, 0.0], 0.0, np.pi, rtol=1e-9)
+    assert result.y[-1] == pytest.approx([-1.0, 0.0], abs=1e-7)
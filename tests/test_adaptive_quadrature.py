@@ -0,0 +1,29 @@
+import math
+
+import numpy as np
+import pytest
+
+from numerical_methods.adaptive_quadrature import adaptive_simpson, gauss_kronrod
+
+
+@pytest.mark.parametrize('method', [adaptive_simpson, gauss_kronrod])
+@pytest.mark.parametrize('f, a, b, exact', [
+    (np.exp, 0.0, 1.0, math.e - 1),
+    (np.sqrt, 0.0, 1.0, 2 / 3),
+    (lambda x: 1 / (1 + 25 * x ** 2), -1.0, 1.0, 0.4 * math.atan(5)),
+])
+def test_integrals_meet_the_tolerance(method, f, a, b, exact):
+    result = method(f, a, b, 1e-10)
+    assert result.integral == pytest.approx(exact, abs=1e-9)
+    assert result.error <= 1e-9
+
+
+def test_gauss_kronrod_needs_fewer_evaluations_on_smooth_integrands():
+    simpson = adaptive_simpson(np.cos, 0, 10, 1e-10)
+    kronrod = gauss_kronrod(np.cos, 0, 10, 1e-10)
+    assert kronrod.integral == pytest.approx(math.sin(10), abs=1e-10)
+    assert kronrod.evaluations < simpson.evaluations
+
+
+def test_constant_integrand():
+    assert gauss_kronrod(lambda x: 3.0, 0, 2).integral == pytest.approx(6)
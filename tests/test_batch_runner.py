@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from numerical_methods.batch_runner import _run_chunk, run_batch, run_job
+
+
+def test_run_job_solves_scalar_lanes():
+    record = run_job({'id': 1, 'method': 'bisection', 'expr': 'x**2 - 2', 'a': 0, 'b': 2, 'tolerance': 1e-12})
+    assert record['result']['root'] == pytest.approx(2 ** 0.5, abs=1e-10)
+    record = run_job({'id': 2, 'method': 'newton', 'expr': 'x**2 - 2', 'x0': 1})
+    assert record['result']['root'] == pytest.approx(2 ** 0.5)
+
+
+@pytest.mark.parametrize('job', [
+    {'id': 3, 'method': 'newton', 'expr': 'x**2 - 2', 'x0': [1, -1]},
+    {'id': 4, 'method': 'bisection', 'expr': 'x**2 - 2', 'a': [0, -2], 'b': 2},
+])
+def test_run_job_rejects_list_lanes(job):
+    record = run_job(job)
+    assert 'result' not in record
+    assert record['error'].startswith('ValueError') and 'one job per value' in record['error']
+
+
+def test_run_job_reports_errors():
+    assert 'Unknown method' in run_job({'id': 5, 'method': 'nope', 'expr': 'x'})['error']
+    assert 'did not converge' in run_job({'id': 6, 'method': 'bisection', 'expr': 'x**2 + 1',
+                                          'a': 0, 'b': 1})['error']
+
+
+def test_grouped_chunk_matches_single_jobs():
+    chunk = [{'id': i, 'method': 'newton', 'expr': 'x**3 - x - 2', 'x0': x0}
+             for i, x0 in enumerate([1.0, 1.5, 2.0])]
+    chunk.append({'id': 3, 'method': 'romberg', 'expr': 'x**2', 'a': 0, 'b': 3})
+    records = _run_chunk(chunk)
+    assert [r['id'] for r in records] == [0, 1, 2, 3]
+    for job, record in zip(chunk, records):
+        assert record['result'] == pytest.approx(run_job(job)['result'])
+    assert records[3]['result']['integral'] == pytest.approx(9)
+
+
+def test_run_batch_writes_one_line_per_job(tmp_path):
+    jobs = tmp_path / 'jobs.jsonl'
+    jobs.write_text('\n'.join(json.dumps(job) for job in [
+        {'id': 1, 'method': 'newton', 'expr': 'cos(x) - x', 'x0': 1},
+        {'id': 2, 'method': 'gauss_kronrod', 'expr': 'exp(x)', 'a': 0, 'b': 1},
+        {'id': 3, 'method': 'newton', 'expr': 'cos(x) - x', 'x0': [1]},
+    ]))
+    results = tmp_path / 'results.jsonl'
+    assert run_batch(str(jobs), str(results), workers=1, chunk_size=2) == (3, 1)
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert [r['id'] for r in records] == [1, 2, 3]
+    assert records[0]['result']['root'] == pytest.approx(0.7390851332)
+    assert records[1]['result']['integral'] == pytest.approx(1.718281828459045)
@@ -0,0 +1,21 @@
+import mpmath
+
+from numerical_methods.high_precision import high_precision_root, precision_schedule
+
+
+def test_square_root_of_two_to_100_digits():
+    result = high_precision_root('x**2 - 2', 1.5, digits=100)
+    with mpmath.workprec(400):
+        assert abs(result.root - mpmath.sqrt(2)) < mpmath.mpf(10) ** -100
+
+
+def test_string_parameters_keep_their_digits():
+    result = high_precision_root('3*x - a', 0.5, digits=60, params={'a': '1/3'})
+    with mpmath.workprec(400):
+        assert abs(result.root - mpmath.mpf(1) / 9) < mpmath.mpf(10) ** -60
+
+
+def test_precision_schedule_doubles_up_to_target():
+    schedule = precision_schedule(1000)
+    assert schedule[-1] == 1000
+    assert all(b <= 2 * a for a, b in zip(schedule, schedule[1:]))
@@ -0,0 +1,12 @@
+from benchmarks.check_import_time import BUDGET_MS, CORE_MODULES, measure
+
+
+def test_package_import_loads_no_heavy_modules():
+    _, loaded = measure(['numerical_methods'], repeat=1)
+    assert not {'numpy', 'sympy', 'scipy', 'matplotlib'} & set(loaded)
+
+
+def test_core_solvers_import_within_budget():
+    elapsed, loaded = measure(CORE_MODULES, repeat=3)
+    assert loaded == []
+    assert elapsed < BUDGET_MS
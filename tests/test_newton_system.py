@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from numerical_methods.newton_system import newton_system
+
+CIRCLE = ['x1**2 + x2**2 - 4', 'exp(x1) + x2 - 1']
+
+
+@pytest.mark.parametrize('update', ['newton', 'chord', 'broyden'])
+def test_updates_reach_the_same_root(update):
+    result = newton_system(CIRCLE, [1, -1], update=update)
+    x1, x2 = result.x
+    assert x1 ** 2 + x2 ** 2 == pytest.approx(4, abs=1e-9)
+    assert np.exp(x1) + x2 == pytest.approx(1, abs=1e-9)
+    assert result.residual_norms[-1] <= 1e-10
+    assert len(result.residual_norms) == result.iterations + 1
+
+
+def test_reuse_saves_jacobian_evaluations():
+    newton = newton_system(CIRCLE, [1, -1], update='newton')
+    broyden = newton_system(CIRCLE, [1, -1], update='broyden')
+    assert newton.jacobian_evaluations == newton.iterations
+    assert broyden.jacobian_evaluations < newton.jacobian_evaluations
+
+
+def test_sparse_tridiagonal_system():
+    # Discretized u'' = u**3 on 60 points with u = 1 at both ends.
+    n = 60
+    exprs = [f"{'x%d' % (i - 1) if i > 1 else 1} - 2*x{i} + {'x%d' % (i + 1) if i < n else 1} - x{i}**3/3600"
+             for i in range(1, n + 1)]
+    dense = newton_system(exprs, np.ones(n), sparse=False)
+    sparse = newton_system(exprs, np.ones(n), sparse='auto')
+    assert sparse.x == pytest.approx(dense.x, abs=1e-10)
+
+
+def test_singular_jacobian_is_reported():
+    with pytest.raises(ValueError, match='singular'):
+        newton_system(['x1**2', 'x2'], [0, 1], update='newton')
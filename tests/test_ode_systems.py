@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from numerical_methods.ode_systems import compile_system, euler_system, parse_system, runge_kutta_4_system
+
+
+def test_parse_system():
+    assert parse_system('x + y', '1') == ('x + y', 1.0)
+    assert parse_system('y2; -y1;', '1, 0') == (['y2', '-y1'], [1.0, 0.0])
+    with pytest.raises(ValueError, match='one initial value per equation'):
+        parse_system('y2; -y1', '1')
+
+
+def test_compiled_system_returns_an_array():
+    f = compile_system(['y2', '-y1 + x'])
+    assert np.array_equal(f(2.0, np.array([3.0, 4.0])), [4.0, -1.0])
+
+
+@pytest.mark.parametrize('method, h, error', [(euler_system, 1e-4, 1e-3), (runge_kutta_4_system, 1e-2, 1e-8)])
+def test_harmonic_oscillator(method, h, error):
+    x, y = method(['y2', '-y1'], [1.0, 0.0], 0.0, 1.0, h)
+    assert y.shape == (len(x), 2)
+    assert y[-1] == pytest.approx([np.cos(x[-1]), -np.sin(x[-1])], abs=error)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from numerical_methods.polynomial import real_polynomial_roots
+from numerical_methods.root_scan import find_all_roots
+
+
+@pytest.mark.parametrize('expr, expected', [
+    ('x**2 - 2.000001*x + 1.000001', [1.0, 1.000001]),
+    ('x**2 - 2.0000001*x + 1.0000001', [1.0, 1.0000001]),
+    ('x*(x - 1e-3)', [0.0, 1e-3]),
+    ('(x - 1)*(x - 1.005)', [1.0, 1.005]),
+])
+def test_close_simple_roots_stay_separate(expr, expected):
+    roots = find_all_roots(expr, -1, 2)
+    # The double-precision coefficients move roots this close by a few 1e-9.
+    assert roots == pytest.approx(expected, abs=1e-8)
+
+
+@pytest.mark.parametrize('expr, expected', [
+    ('x**2 - 2*x + 1', [1.0]),
+    ('x**4 - 4*x**3 + 6*x**2 - 4*x + 1', [1.0]),
+    ('(x - 1)**7', [1.0]),
+    ('(x - 1)**5*(x - 2)', [1.0, 2.0]),
+    ('x**4 - 2*x**2 + 1', [-1.0, 1.0]),
+])
+def test_multiple_roots_are_merged(expr, expected):
+    roots = find_all_roots(expr, -3, 3)
+    assert roots == pytest.approx(expected, abs=1e-10)
+
+
+def test_near_double_root_from_rounded_coefficients():
+    # (x - 0.48)**2 * (x + 0.77)**4 * (x + 2.3)**3 with coefficients rounded to doubles.
+    coeffs = np.poly1d([0.48] * 2 + [-0.77] * 4 + [-2.3] * 3, r=True).coeffs
+    assert real_polynomial_roots(coeffs) == pytest.approx([-2.3, -0.77, 0.48], abs=1e-6)
+
+
+def test_ill_conditioned_simple_roots_are_not_merged():
+    coeffs = np.poly(np.arange(1, 21))
+    assert len(real_polynomial_roots(coeffs)) == 20
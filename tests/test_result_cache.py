@@ -0,0 +1,69 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from numerical_methods.adaptive_quadrature import QuadratureResult
+from numerical_methods.result_cache import ResultCache, cache_key, open_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / 'results.sqlite'))
+
+
+def test_equivalent_expressions_share_a_key():
+    assert cache_key('bisection', 'x**2 - 2', {'a': 1, 'b': 2}) == \
+        cache_key('bisection', '-2 + x**2', {'a': 1.0, 'b': 2.0})
+    assert cache_key('bisection', 'x**2 - 2', {'a': 1}) != cache_key('newton', 'x**2 - 2', {'a': 1})
+
+
+def test_round_trip_keeps_types(cache):
+    result = {'roots': np.array([1.0, 2.0]), 'fit': QuadratureResult(1.5, 1e-9, 15), 'pair': (1, 'a')}
+    cache.put('m', 'x', {}, result)
+    stored = cache.get('m', 'x', {})
+    assert np.array_equal(stored['roots'], result['roots'])
+    assert stored['fit'] == result['fit'] and type(stored['fit']) is QuadratureResult
+    assert stored['pair'] == (1, 'a')
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_stored_none_is_a_hit(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_compute('m', 'x', {}, compute) is None
+    assert cache.get_or_compute('m', 'x', {}, compute) is None
+    assert len(calls) == 1
+    assert cache.get('m', 'y', {}, 'missing') == 'missing'
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite'), max_bytes=250)
+    for name in 'abc':
+        cache.put('m', name, {}, 'v' * 100)
+        if name == 'b':
+            cache.get('m', 'a', {})
+    assert cache.get('m', 'b', {}) is None
+    assert cache.get('m', 'a', {}) == 'v' * 100 and cache.get('m', 'c', {}) == 'v' * 100
+    count, total = cache.size()
+    assert count == 2 and total <= 250
+
+
+def test_last_used_is_indexed(cache):
+    cache.put('m', 'x', {}, 1)
+    with sqlite3.connect(cache.path) as db:
+        plan = ' '.join(row[-1] for row in db.execute(
+            'EXPLAIN QUERY PLAN SELECT key FROM results ORDER BY last_used LIMIT 1'))
+    assert 'results_last_used' in plan
+
+
+def test_disabled_cache_always_computes(monkeypatch):
+    monkeypatch.delenv('NUMERICAL_METHODS_CACHE', raising=False)
+    cache = open_cache()
+    assert not cache.enabled
+    assert cache.get_or_compute('m', 'x', {}, lambda: 3) == 3
+    assert cache.get('m', 'x', {}) is None and cache.size() == (0, 0)
@@ -0,0 +1,31 @@
+import math
+
+import numpy as np
+import pytest
+
+from numerical_methods.romberg import RombergIntegrator, romberg
+
+
+def test_romberg_converges():
+    assert romberg(np.exp, 0, 1, 1e-12) == pytest.approx(math.e - 1, abs=1e-12)
+    assert romberg(lambda x: 2.0, 0, 3) == pytest.approx(6)
+
+
+def test_refine_only_evaluates_new_midpoints():
+    calls = []
+
+    def f(x):
+        calls.append(len(x))
+        return np.sin(x)
+
+    integrator = RombergIntegrator(f, 0, math.pi)
+    for _ in range(5):
+        integrator.refine()
+    assert calls == [2, 1, 2, 4, 8, 16]
+    assert integrator.evaluations == sum(calls) == integrator.n + 1
+    assert integrator.estimate == pytest.approx(2, abs=1e-9)
+
+
+def test_bad_interval():
+    with pytest.raises(ValueError):
+        romberg(np.exp, 1, 0)
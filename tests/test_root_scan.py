@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from numerical_methods.root_scan import find_all_roots
+
+
+def test_scan_finds_sign_changes_and_even_roots():
+    roots = find_all_roots('sin(x)**2 - 0.25', 0, 4)
+    assert roots == pytest.approx([np.pi / 6, 5 * np.pi / 6, 7 * np.pi / 6], abs=1e-9)
+    assert find_all_roots('sin(x)**2', 1, 5) == pytest.approx([np.pi], abs=1e-6)
+
+
+def test_progress_covers_every_refinement():
+    reported = []
+    find_all_roots('sin(10*x)', 0, 1, adaptive=True, max_refinements=3, progress=reported.append)
+    # The first scan plus two refinements that add nothing, which end the
+    # search early; each scan reports three stages.
+    assert len(reported) == 9
+    assert reported == sorted(reported)
+    assert reported[0] == 0 and reported[-1] < 1
+
+
+def test_progress_can_abort_the_scan():
+    class Cancelled(Exception):
+        pass
+
+    def progress(fraction):
+        if fraction > 0:
+            raise Cancelled
+
+    with pytest.raises(Cancelled):
+        find_all_roots('sin(x)', 0, 10, adaptive=True, progress=progress)
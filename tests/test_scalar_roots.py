@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+from false_position_method import illinois_method
+from numerical_methods.parameter_sweep import sweep_roots
+from numerical_methods.scalar_roots import (CONVERGED, DIVERGED, MAX_ITERATIONS, STALLED, ZERO_DERIVATIVE,
+                                            scalar_illinois, scalar_newton)
+
+
+def test_newton_statuses():
+    square = lambda x: (x * x - 2, 2 * x)
+    result = scalar_newton(square, 1.0, 1e-12, 50)
+    assert result.status == CONVERGED and result.root == pytest.approx(math.sqrt(2))
+    assert scalar_newton(square, 0.0, 1e-12, 50).status == ZERO_DERIVATIVE
+    assert scalar_newton(square, 1.0, 1e-12, 2) == (pytest.approx(1.4166, abs=1e-4), 2, MAX_ITERATIONS)
+    assert scalar_newton(lambda x: (1.0, 1e-320), 1.0, 1e-12, 50).status == DIVERGED
+
+
+def test_newton_stops_when_steps_grow():
+    # Newton on the real cube root maps x to -2x; the second step is not taken.
+    cube_root = lambda x: (math.copysign(abs(x) ** (1 / 3), x), abs(x) ** (-2 / 3) / 3)
+    result = scalar_newton(cube_root, 1.0, 1e-12, 50, stop_on_growth=True)
+    assert result == (-2.0, 2, STALLED)
+
+
+def test_newton_reports_progress():
+    reported = []
+    scalar_newton(lambda x: (x - 1e9, 1e-3), 0.0, 1e-12, 10, progress=reported.append, report_every=4)
+    assert reported == [0, 0.4, 0.8]
+
+
+def test_illinois_counts_iterations():
+    result = scalar_illinois(lambda x: x ** 3 - x - 2, 1.0, 2.0, -2.0, 4.0, 1e-12, 100)
+    assert result.status == CONVERGED and result.root == pytest.approx(1.5213797068045676)
+    assert result.iterations < 15
+    assert illinois_method(1, 2, 1e-12, 100, 'x**3 - x - 2') == pytest.approx(result.root)
+
+
+@pytest.mark.parametrize('options', [{'x0': 1.5}, {'bracket': (1, 2), 'method': 'illinois'}])
+def test_sweep_follows_the_root(options):
+    values = [0, 0.5, 1.0, 1.5]
+    result = sweep_roots('x**3 - a*x - 2', 'a', values, **options)
+    assert result.converged.all()
+    for a, root in zip(values, result.roots):
+        assert root ** 3 - a * root - 2 == pytest.approx(0, abs=1e-9)
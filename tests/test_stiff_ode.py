@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from numerical_methods.stiff_ode import backward_euler, bdf2, rosenbrock
+
+# y' = -1000 (y - cos x), y(0) = 0: explicit methods blow up at h = 0.1.
+STIFF = '-1000*(y - cos(x))'
+
+
+def stiff_solution(x):
+    return (1e6 * np.cos(x) + 1e3 * np.sin(x) - 1e6 * np.exp(-1e3 * x)) / (1e6 + 1)
+
+
+@pytest.mark.parametrize('method, error', [(backward_euler, 1e-3), (bdf2, 1e-3), (rosenbrock, 1e-3)])
+def test_large_steps_stay_stable(method, error):
+    result = method(STIFF, 0.0, 0.0, 2.0, 0.1)
+    assert result.y.shape == result.x.shape
+    assert np.all(np.isfinite(result.y))
+    assert result.y[-1] == pytest.approx(stiff_solution(result.x[-1]), abs=error)
+
+
+@pytest.mark.parametrize('method, order', [(backward_euler, 1), (bdf2, 2), (rosenbrock, 2)])
+def test_order_of_accuracy(method, order):
+    errors = []
+    for h in (0.02, 0.01):
+        result = method('-y + x', 1.0, 0.0, 1.0, h)
+        errors.append(abs(result.y[-1] - (result.x[-1] - 1 + 2 * np.exp(-result.x[-1]))))
+    assert np.log2(errors[0] / errors[1]) == pytest.approx(order, abs=0.2)
+
+
+def test_system_and_counters():
+    # Linear stiff system with eigenvalues -1 and -1000.
+    result = backward_euler(['-y1', '-1000*y2 + y1'], [1.0, 1.0], 0.0, 1.0, 0.05)
+    assert result.y.shape == (len(result.x), 2)
+    assert result.y[-1, 0] == pytest.approx(np.exp(-result.x[-1]), rel=0.05)
+    assert result.newton_iterations >= len(result.x) - 1
+    assert result.jacobian_evaluations >= 1
+    with pytest.raises(ValueError, match='one initial value per equation'):
+        rosenbrock(['-y1', '-y2'], [1.0], 0.0, 1.0, 0.1)
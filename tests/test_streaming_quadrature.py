@@ -0,0 +1,29 @@
+import math
+
+import numpy as np
+import pytest
+
+from numerical_methods.streaming_quadrature import simpsons_rule_streaming
+
+
+def simpsons_rule(f, a, b, n):
+    x = np.linspace(a, b, n + 1)
+    y = f(x)
+    return (b - a) / n / 3 * (y[0] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-2:2]) + y[-1])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 16])
+def test_chunks_match_the_in_memory_rule(chunk_size):
+    assert simpsons_rule_streaming(np.sin, 0, math.pi, 100, chunk_size) == \
+        pytest.approx(simpsons_rule(np.sin, 0, math.pi, 100), rel=1e-14)
+
+
+def test_progress_reaches_one():
+    reported = []
+    simpsons_rule_streaming(np.exp, 0, 1, 1000, chunk_size=100, progress=reported.append)
+    assert reported == sorted(reported) and reported[-1] == pytest.approx(1)
+
+
+def test_odd_intervals_are_rejected():
+    with pytest.raises(ValueError, match='even'):
+        simpsons_rule_streaming(np.exp, 0, 1, 11)